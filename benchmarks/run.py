@@ -0,0 +1,281 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Benchmarks of Invenio-JSONSchemas.
+
+A synthetic catalog of schemas is generated in a temporary directory, then
+the registration, lookup, resolution and serving of the schemas are timed.
+The results are written as a JSON report, which can be compared between two
+versions to catch regressions.
+
+Usage::
+
+    python benchmarks/run.py --size 500 --fan-out 3 --depth 2 -o report.json
+"""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from flask import Flask
+
+import invenio_jsonschemas
+from invenio_jsonschemas import InvenioJSONSchemas
+from invenio_jsonschemas.ext import InvenioJSONSchemasState
+from invenio_jsonschemas.utils import resolve_schema, thaw
+
+VARIANTS = [(False, False), (True, False), (False, True), (True, True)]
+"""``(with_refs, resolved)`` combinations passed to ``get_schema``."""
+
+
+def generate_catalog(directory, size, fan_out, depth):
+    """Write a catalog of schemas referencing each other.
+
+    :param directory: directory to write the schemas in.
+    :param size: number of schemas.
+    :param fan_out: number of schemas referenced by each schema.
+    :param depth: depth of the nested "allOf" of each schema.
+    :returns: the paths of the schemas.
+    """
+    paths = []
+    for index in range(size):
+        path = "records/record-{0}-v1.0.0.json".format(index)
+        properties = {
+            "title": {"type": "string"},
+            "number": {"type": "integer"},
+        }
+        # the schemas form a tree, so that the refs are finite once replaced
+        for ref in range(index * fan_out + 1, min(size, (index + 1) * fan_out + 1)):
+            properties["ref_{0}".format(ref)] = {
+                "$ref": "record-{0}-v1.0.0.json".format(ref)
+            }
+        schema = {"type": "object", "properties": properties}
+        for level in range(depth):
+            schema = {
+                "allOf": [
+                    schema,
+                    {
+                        "title": "Level {0}".format(level),
+                        "properties": {"level_{0}".format(level): {"type": "string"}},
+                    },
+                ]
+            }
+        schema["$schema"] = "http://json-schema.org/draft-07/schema#"
+        filename = os.path.join(directory, path)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "w") as file_:
+            json.dump(schema, file_)
+        paths.append(path)
+    return paths
+
+
+def create_app(ref_expander):
+    """Create the application serving the catalog."""
+    app = Flask("benchmarks")
+    app.config.update(
+        JSONSCHEMAS_HOST="schemas.example.org",
+        JSONSCHEMAS_SCHEMA_CACHE_SIZE=None,
+        JSONSCHEMAS_RESPONSE_CACHE_SIZE=None,
+    )
+    if ref_expander == "native":
+        app.config["JSONSCHEMAS_REF_EXPANDER_CLS"] = (
+            "invenio_jsonschemas.refs.RefExpander"
+        )
+    else:
+        app.config["JSONSCHEMAS_LOADER_CLS"] = lambda: StateLoader(app)
+    InvenioJSONSchemas(app, entry_point_group=None)
+    return app
+
+
+class StateLoader(object):
+    """JsonRef loader reading the registered schemas instead of fetching them."""
+
+    def __init__(self, app):
+        """Constructor."""
+        self.state = app.extensions["invenio-jsonschemas"]
+
+    def __call__(self, uri):
+        """Load a schema."""
+        return thaw(self.state.get_schema(self.state.url_to_path(uri)))
+
+
+def measure(name, func, repeat, setup=None, **params):
+    """Time a function.
+
+    :param name: name of the benchmark.
+    :param func: function to time, called without arguments.
+    :param repeat: number of runs.
+    :param setup: function called before each run, which is not timed.
+    :returns: the result of the benchmark.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    result = {
+        "name": name,
+        "params": params,
+        "runs": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "max": max(timings),
+    }
+    print(
+        "{0:<40} {1:<40} {2:>10.6f}s".format(
+            name, json.dumps(params, sort_keys=True), result["median"]
+        ),
+        file=sys.stderr,
+    )
+    return result
+
+
+def run(size, fan_out, depth, repeat, ref_expander):
+    """Run all the benchmarks.
+
+    :returns: the report.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        paths = generate_catalog(directory, size, fan_out, depth)
+        app = create_app(ref_expander)
+        state = app.extensions["invenio-jsonschemas"]
+
+        def register():
+            InvenioJSONSchemasState(app).register_schemas_dir(directory)
+
+        results.append(measure("register_schemas_dir", register, repeat))
+
+        for threads in (1, 4):
+
+            def load():
+                state = InvenioJSONSchemasState(app)
+                state.load_schemas_dirs([directory], threads=threads)
+
+            results.append(measure("load_schemas_dirs", load, repeat, threads=threads))
+        state.register_schemas_dir(directory)
+        base_url = state.path_to_url(paths[0])
+
+        for with_refs, resolved in VARIANTS:
+
+            def get_schemas():
+                with app.test_request_context(base_url):
+                    for path in paths:
+                        state.get_schema(path, with_refs=with_refs, resolved=resolved)
+
+            params = {"with_refs": with_refs, "resolved": resolved}
+            results.append(
+                measure(
+                    "get_schema (cold)",
+                    get_schemas,
+                    repeat,
+                    setup=state.clear_caches,
+                    **params,
+                )
+            )
+            results.append(measure("get_schema (warm)", get_schemas, repeat, **params))
+
+        with app.test_request_context(base_url):
+            schemas = [state.get_schema(path, with_refs=True) for path in paths]
+        results.append(
+            measure(
+                "resolve_schema",
+                lambda: [resolve_schema(schema) for schema in schemas],
+                repeat,
+            )
+        )
+
+        results.append(
+            measure(
+                "refresolver_store (cold)",
+                state.refresolver_store,
+                repeat,
+                setup=state.clear_caches,
+            )
+        )
+        results.append(
+            measure("refresolver_store (warm)", state.refresolver_store, repeat)
+        )
+
+        urls = [state.path_to_url(path) for path in paths]
+        results.append(
+            measure(
+                "url_to_path",
+                lambda: [state.url_to_path(url) for url in urls],
+                repeat,
+            )
+        )
+        results.append(
+            measure(
+                "path_to_url",
+                lambda: [state.path_to_url(path) for path in paths],
+                repeat,
+            )
+        )
+
+        client = app.test_client()
+        for query in ("", "?refs=1", "?resolved=1"):
+
+            def get_responses():
+                for url in urls:
+                    response = client.get(url + query)
+                    assert response.status_code == 200
+
+            results.append(
+                measure("endpoint", get_responses, repeat, query=query or None)
+            )
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "version": invenio_jsonschemas.__version__,
+        "params": {
+            "size": size,
+            "fan_out": fan_out,
+            "depth": depth,
+            "repeat": repeat,
+            "ref_expander": ref_expander,
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200, help="number of schemas")
+    parser.add_argument(
+        "--fan-out", type=int, default=3, help="schemas referenced by each schema"
+    )
+    parser.add_argument("--depth", type=int, default=2, help="depth of the allOf")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark")
+    parser.add_argument(
+        "--ref-expander",
+        choices=["jsonref", "native"],
+        default="jsonref",
+        help="engine replacing the $ref",
+    )
+    parser.add_argument("--output", "-o", help="report file, defaults to stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args.size, args.fan_out, args.depth, args.repeat, args.ref_expander)
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file_:
+            file_.write(data)
+    else:
+        print(data)
+
+
+if __name__ == "__main__":
+    main()
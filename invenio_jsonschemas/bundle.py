@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Export of the schemas as static files."""
+
+from __future__ import absolute_import, print_function
+
+import hashlib
+import json
+import os
+
+from .errors import JSONSchemaNotFound
+
+VARIANTS = {
+    "raw": (False, False),
+    "refs": (True, False),
+    "resolved": (True, True),
+}
+"""Exported variants of the schemas, with their ``(with_refs, resolved)``."""
+
+MANIFEST_FILENAME = "manifest.json"
+"""Name of the manifest written in the output directory."""
+
+
+def write_bundle(state, output, paths=None, variants=("resolved",), single_file=False):
+    """Write schemas to files named after their content.
+
+    Each variant of each schema is written to
+    ``<variant>/<path without extension>.<hash>.json``, or all of them to a
+    single ``bundle.<hash>.json`` file mapping the variants to the schemas by
+    path. As the file names change with their content, they can be served
+    from a static storage or a CDN and cached forever.
+
+    The ``manifest.json`` file, written last, maps each schema path to its
+    canonical URL and, per variant, to its file and entity tag.
+
+    :param state: :class:`invenio_jsonschemas.ext.InvenioJSONSchemasState`
+        instance used to retrieve the schemas.
+    :param output: output directory.
+    :param paths: paths of the schemas to write. (Default: all the registered
+        schemas)
+    :param variants: names of the variants to write, see :data:`VARIANTS`.
+    :param single_file: write all the schemas in a single file.
+    :raises invenio_jsonschemas.errors.JSONSchemaNotFound: If a schema is not
+        registered.
+    :returns: The manifest.
+    """
+    paths = sorted(state.schemas if paths is None else paths)
+    for path in paths:
+        if path not in state.schemas:
+            raise JSONSchemaNotFound(path)
+    for variant in variants:
+        if variant not in VARIANTS:
+            raise ValueError("Unknown schema variant {0}".format(variant))
+
+    manifest = {"schemas": {}}
+    bundle = {variant: [] for variant in variants}
+    for path in paths:
+        url = state.path_to_url(path)
+        entry = manifest["schemas"][path] = {"url": url}
+        with state.app.app_context():
+            for variant in variants:
+                with_refs, resolved = VARIANTS[variant]
+                serialized = state.get_serialized_schema(
+                    path, with_refs=with_refs, resolved=resolved
+                )
+                entry[variant] = {"etag": serialized.etag}
+                if single_file:
+                    # the data of the shared cache is a memoryview
+                    data = bytes(serialized.data).strip()
+                    bundle[variant].append((json.dumps(path).encode("utf-8"), data))
+                else:
+                    filename = _hashed_filename(
+                        os.path.join(variant, path), serialized.data
+                    )
+                    _write(output, filename, serialized.data)
+                    entry[variant]["file"] = filename
+
+    if single_file:
+        data = _join(
+            (json.dumps(variant).encode("utf-8"), _join(bundle[variant]))
+            for variant in variants
+        )
+        filename = _hashed_filename("bundle.json", data)
+        _write(output, filename, data)
+        manifest["bundle"] = filename
+
+    _write(
+        output,
+        MANIFEST_FILENAME,
+        json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"),
+    )
+    return manifest
+
+
+def _hashed_filename(filename, data):
+    """Insert the hash of the content in a file name."""
+    root, ext = os.path.splitext(filename)
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    return "{0}.{1}{2}".format(root, digest, ext).replace(os.sep, "/")
+
+
+def _join(items):
+    """Encode ``(encoded key, encoded value)`` pairs as a JSON object."""
+    return b"{" + b",".join(key + b":" + value for key, value in items) + b"}"
+
+
+def _write(output, filename, data):
+    """Write a file atomically."""
+    filename = os.path.join(output, filename)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    tmp_filename = "{0}.{1}.tmp".format(filename, os.getpid())
+    with open(tmp_filename, "wb") as file_:
+        file_.write(data)
+    os.replace(tmp_filename, filename)
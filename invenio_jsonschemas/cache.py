@@ -0,0 +1,326 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Caches used by Invenio-JSONSchemas."""
+
+from __future__ import absolute_import, print_function
+
+import gzip
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSORS = {"gzip": gzip.compress}
+"""Functions compressing the serialized schemas, per content encoding."""
+
+if brotli is not None:
+    COMPRESSORS["br"] = brotli.compress
+
+SerializedSchema = namedtuple("SerializedSchema", ["data", "etag", "encodings"])
+"""Schema encoded as a JSON document.
+
+``encodings`` maps content encodings (e.g. ``gzip``) to the compressed data.
+"""
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "size"])
+"""Statistics of a cache."""
+
+
+class LRUCache(object):
+    """Thread-safe mapping evicting its least recently used entries."""
+
+    def __init__(self, maxsize=None):
+        """Constructor.
+
+        :param maxsize: maximum number of entries. ``None`` means unbounded and
+            ``0`` disables the cache.
+        """
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        """Get an entry, marking it as recently used.
+
+        :param key: key of the entry.
+        :param default: value returned if the entry is missing.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Add an entry, evicting the least recently used ones if needed.
+
+        :param key: key of the entry.
+        :param value: value of the entry.
+        """
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def evict(self, predicate):
+        """Remove all the entries whose key matches a predicate.
+
+        :param predicate: function called with each key.
+        """
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """Get the statistics of the cache.
+
+        :returns: A :class:`CacheInfo`.
+        """
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self._data)
+        )
+
+    def __contains__(self, key):
+        """Check if an entry is cached, without marking it as used."""
+        return key in self._data
+
+    def __len__(self):
+        """Number of cached entries."""
+        return len(self._data)
+
+
+class SingleFlight(object):
+    """Share a computation between the threads requesting it at the same time.
+
+    The first thread calling :meth:`do` with a key computes the value, the
+    threads calling it with the same key meanwhile wait for that value, or
+    raise the same exception. A thread arriving just after a computation
+    ended starts a new one, so the value is looked up again in its cache
+    first.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, cached=None):
+        """Compute a value, unless it is already being computed.
+
+        :param key: key identifying the computation.
+        :param func: function computing the value, called without arguments.
+        :param cached: function called without arguments before ``func``,
+            returning the value if a previous computation cached it, or
+            ``None``.
+        :returns: The computed value.
+        """
+        ident = threading.get_ident()
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                future = Future()
+                self._calls[key] = (future, ident)
+        if call is not None:
+            if call[1] == ident:
+                # the computation needs itself, waiting would never end
+                return func()
+            return call[0].result()
+        try:
+            result = cached() if cached is not None else None
+            if result is None:
+                result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def __len__(self):
+        """Number of computations in progress."""
+        return len(self._calls)
+
+
+class SharedSchemaCache(object):
+    """Read-only cache of serialized schemas in a memory-mapped file.
+
+    The file is built once, e.g. at deploy time, and then mapped by all the
+    worker processes, which share its memory instead of each holding their own
+    copy of the schemas.
+    """
+
+    MAGIC = b"INVENIO-JSONSCHEMAS-CACHE-1\n"
+    """Marker at the beginning of the file."""
+
+    def __init__(self, filename):
+        """Constructor.
+
+        :param filename: path of the cache file.
+        :raises ValueError: If the file is not a valid cache file.
+        """
+        with open(filename, "rb") as file_:
+            self._mmap = mmap.mmap(file_.fileno(), 0, access=mmap.ACCESS_READ)
+        header_size = len(self.MAGIC) + 8
+        if self._mmap[: len(self.MAGIC)] != self.MAGIC:
+            raise ValueError("{0} is not a schemas cache file".format(filename))
+        (index_size,) = struct.unpack(">Q", self._mmap[len(self.MAGIC) : header_size])
+        index = json.loads(self._mmap[header_size : header_size + index_size])
+        self._offset = header_size + index_size
+        self.schemas = index["schemas"]
+        self._entries = index["entries"]
+
+    @staticmethod
+    def entry_key(path, with_refs, resolved, base_uri):
+        """Build the key of a schema variant in the file."""
+        return json.dumps([path, bool(with_refs), bool(resolved), base_uri])
+
+    def get(self, path, with_refs, resolved, base_uri):
+        """Get a schema variant.
+
+        The data and its encodings are :class:`memoryview` slices of the
+        file, nothing is copied until they are used.
+
+        :returns: A :class:`SerializedSchema` or ``None`` if it is not cached.
+        """
+        entry = self._entries.get(self.entry_key(path, with_refs, resolved, base_uri))
+        if entry is None:
+            return None
+        return SerializedSchema(
+            self._read(entry["data"]),
+            entry["etag"],
+            {k: self._read(v) for k, v in entry["encodings"].items()},
+        )
+
+    def _read(self, location):
+        """Read bytes from the data section of the file, without copying."""
+        start = self._offset + location[0]
+        return memoryview(self._mmap)[start : start + location[1]]
+
+    @classmethod
+    def write(cls, filename, schemas, variants):
+        """Write a cache file.
+
+        :param filename: path of the cache file.
+        :param schemas: mapping of the schema paths to their directory.
+        :param variants: iterable of ``(path, with_refs, resolved, base_uri,
+            serialized)`` tuples, where ``serialized`` is a
+            :class:`SerializedSchema`.
+        """
+        entries, chunks, size = {}, [], 0
+
+        def add(data):
+            nonlocal size
+            chunks.append(data)
+            size += len(data)
+            return [size - len(data), len(data)]
+
+        for path, with_refs, resolved, base_uri, serialized in variants:
+            entries[cls.entry_key(path, with_refs, resolved, base_uri)] = {
+                "etag": serialized.etag,
+                "data": add(serialized.data),
+                "encodings": {k: add(v) for k, v in serialized.encodings.items()},
+            }
+        index = json.dumps({"schemas": schemas, "entries": entries}).encode("utf-8")
+        # write then rename, so that workers never map a partial file
+        tmp_filename = "{0}.{1}.tmp".format(filename, os.getpid())
+        with open(tmp_filename, "wb") as file_:
+            file_.write(cls.MAGIC)
+            file_.write(struct.pack(">Q", len(index)))
+            file_.write(index)
+            for chunk in chunks:
+                file_.write(chunk)
+        os.replace(tmp_filename, filename)
+
+
+class ParsedSchemaCache(object):
+    """Directory caching the parsed schema files.
+
+    The schemas are stored in the :mod:`marshal` format, which is much faster
+    to load than JSON, along with the modification time and size of their
+    file. An entry is ignored as soon as its file is modified, and written
+    again after the file is parsed.
+    """
+
+    VERSION = 1
+    """Version of the format of the entries."""
+
+    def __init__(self, directory):
+        """Constructor.
+
+        :param directory: path of the cache directory.
+        """
+        self.directory = directory
+
+    def get(self, filename, default=None):
+        """Get the parsed content of a schema file.
+
+        :param filename: path of the schema file.
+        :param default: value returned if the entry is missing or outdated.
+        """
+        try:
+            stat = os.stat(filename)
+            with open(self._entry_filename(filename), "rb") as file_:
+                version, mtime, size, schema = marshal.load(file_)
+        except (OSError, EOFError, ValueError, TypeError):
+            return default
+        if (version, mtime, size) != (self.VERSION, stat.st_mtime_ns, stat.st_size):
+            return default
+        return schema
+
+    def set(self, filename, schema, stat):
+        """Store the parsed content of a schema file.
+
+        Errors are ignored, the file will then be parsed again.
+
+        :param filename: path of the schema file.
+        :param schema: the parsed schema.
+        :param stat: result of :func:`os.stat` on the file, before it was read.
+        """
+        entry = (self.VERSION, stat.st_mtime_ns, stat.st_size, schema)
+        entry_filename = self._entry_filename(filename)
+        tmp_filename = "{0}.{1}.tmp".format(entry_filename, os.getpid())
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_filename, "wb") as file_:
+                marshal.dump(entry, file_)
+            os.replace(tmp_filename, entry_filename)
+        except (OSError, ValueError):
+            pass
+
+    def _entry_filename(self, filename):
+        """Get the path of the entry of a schema file."""
+        key = hashlib.sha256(os.path.abspath(filename).encode("utf-8")).hexdigest()
+        # the marshal format depends on the Python version
+        return os.path.join(
+            self.directory, "{0}.{1}.marshal".format(key, sys.implementation.cache_tag)
+        )
@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio-JSONSchemas CLI."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from .bundle import VARIANTS
+from .ext import InvenioJSONSchemasState
+from .index import write_index
+from .proxies import current_jsonschemas
+
+
+@click.group()
+def jsonschemas():
+    """Manage the JSON Schemas."""
+
+
+@jsonschemas.command("index")
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False),
+    help="Index file, defaults to JSONSCHEMAS_INDEX_FILE.",
+)
+@with_appcontext
+def index(output):
+    """Write the index of the schemas registered from entry points."""
+    output = output or current_app.config["JSONSCHEMAS_INDEX_FILE"]
+    if not output:
+        raise click.UsageError("No --output given and JSONSCHEMAS_INDEX_FILE unset.")
+    state = InvenioJSONSchemasState(current_app)
+    state.entry_points = current_jsonschemas.entry_points
+    state.register_entry_points(use_index=False)
+    write_index(output, state.entry_points, state.schemas)
+    click.secho(
+        "Indexed {0} schemas in {1}".format(len(state.schemas), output), fg="green"
+    )
+
+
+@jsonschemas.command("warm")
+@click.option("--refs/--no-refs", default=True, help="Replace the $ref.")
+@click.option("--resolved/--no-resolved", default=True, help="Resolve the schemas.")
+@click.option("--threads", "-t", type=int, default=1, help="Number of threads.")
+@click.option(
+    "--shared-cache",
+    type=click.Path(dir_okay=False),
+    help="Also write the schemas to this shared cache file.",
+)
+@with_appcontext
+def warm(refs, resolved, threads, shared_cache):
+    """Load and resolve all the registered schemas."""
+    errors = current_jsonschemas.warm(
+        with_refs=refs, resolved=resolved, threads=threads
+    )
+    for path, error in errors:
+        click.secho("{0}: {1}".format(path, error), fg="red", err=True)
+    click.secho(
+        "Loaded {0} schemas".format(len(current_jsonschemas.schemas) - len(errors)),
+        fg="green",
+    )
+    if errors:
+        raise click.exceptions.Exit(1)
+    if shared_cache:
+        current_jsonschemas.write_shared_cache(
+            shared_cache, with_refs=refs, resolved=resolved
+        )
+        click.secho("Wrote shared cache {0}".format(shared_cache), fg="green")
+
+
+@jsonschemas.command("bundle")
+@click.argument("output", type=click.Path(file_okay=False))
+@click.option(
+    "--variant",
+    "-v",
+    "variants",
+    type=click.Choice(sorted(VARIANTS)),
+    multiple=True,
+    help="Variant of the schemas to write, defaults to resolved.",
+)
+@click.option(
+    "--schema",
+    "-s",
+    "paths",
+    multiple=True,
+    help="Path of a schema to write, defaults to all of them.",
+)
+@click.option("--single-file", is_flag=True, help="Write a single bundle file.")
+@with_appcontext
+def bundle(output, variants, paths, single_file):
+    """Write the schemas to static files named after their content."""
+    for path in paths:
+        if path not in current_jsonschemas.schemas:
+            raise click.BadParameter(
+                "{0} is not registered".format(path), param_hint="--schema"
+            )
+    manifest = current_jsonschemas.export_bundle(
+        output,
+        paths=paths or None,
+        variants=variants or ("resolved",),
+        single_file=single_file,
+    )
+    click.secho(
+        "Wrote {0} schemas to {1}".format(len(manifest["schemas"]), output),
+        fg="green",
+    )
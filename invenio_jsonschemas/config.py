@@ -26,14 +26,115 @@ before serving a schema.
 JSONSCHEMAS_LOADER_CLS = None
 """Loader class used in ``JSONRef`` when replacing ``$ref``."""
 
+JSONSCHEMAS_REF_EXPANDER_CLS = None
+"""Class used to replace ``$ref`` before serving a schema.
+
+If ``None``, ``JSONRef`` is used. Set it to
+:class:`invenio_jsonschemas.refs.RefExpander` to load the registered schemas
+directly and support recursive schemas.
+"""
+
+JSONSCHEMAS_REF_EXPANSION_MAX_DEPTH = None
+"""Maximum number of nested ``$ref`` expanded by the ref expander class.
+
+Deeper references are replaced by references to the ``$defs`` of the schema.
+Only used by :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_REF_EXPANDER_CLS`.
+"""
+
 JSONSCHEMAS_RESOLVER_CLS = "invenio_jsonschemas.utils.resolve_schema"
 """Resolver used to resolve the schema.
 
 if :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_RESOLVE_SCHEMA` is
 ``True`` or there is ``?resolved=1`` parameter on the request the resolver
 will run over the schema. This can be used for custom schemas resolver.
+
+:func:`invenio_jsonschemas.resolvers.resolve_all_of` gives the same result as
+the default resolver, faster on large schemas.
+:data:`invenio_jsonschemas.resolvers.resolve_all_keywords` also resolves
+"allOf" in all the sub-schemas, e.g. in ``definitions`` or ``oneOf``.
+"""
+
+JSONSCHEMAS_SCHEMA_CACHE_SIZE = 1000
+"""Maximum number of schemas kept in the cache of each application.
+
+The least recently used schemas are evicted first. Each combination of schema,
+replaced ``$ref`` and resolution, counts as one entry. ``None`` means
+unbounded and ``0`` disables the cache.
+"""
+
+JSONSCHEMAS_RESPONSE_CACHE_SIZE = 100
+"""Maximum number of serialized schemas kept in the cache of each application.
+
+The endpoint serves schemas with replaced ``$ref`` or resolved from this
+cache, without serializing them again. ``None`` means unbounded and ``0``
+disables the cache.
+"""
+
+JSONSCHEMAS_STREAM_CHUNK_SIZE = None
+"""Stream the large schemas with replaced ``$ref`` or resolved in chunks.
+
+If set, the schemas with replaced ``$ref`` or resolved whose encoding is
+larger than :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_STREAM_MIN_SIZE`
+are not kept in the response cache. Only their entity tag is, and they are
+encoded while being sent, in chunks of about this many bytes, instead of
+building the whole document in memory. Streamed responses are not
+compressed. Smaller schemas are cached and served as usual.
+"""
+
+JSONSCHEMAS_STREAM_MIN_SIZE = 1024 * 1024
+"""Size in bytes above which the encoded schemas are streamed.
+
+See :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_STREAM_CHUNK_SIZE`.
+"""
+
+JSONSCHEMAS_ASYNC_VIEWS = False
+"""Serve the schemas with an asynchronous view, e.g. behind an ASGI server.
+
+The view loads the schemas in a thread pool instead of blocking the event
+loop. Flask needs to be installed with the ``async`` extra.
+"""
+
+JSONSCHEMAS_ASYNC_WORKERS = None
+"""Number of threads loading the schemas for the asynchronous API.
+
+``None`` uses the default of :class:`concurrent.futures.ThreadPoolExecutor`.
+"""
+
+JSONSCHEMAS_PRECOMPRESS_ENCODINGS = []
+"""Content encodings in which the serialized schemas are also cached.
+
+Supported values are ``gzip`` and ``br`` (requires the ``brotli`` package).
+The endpoint picks one according to the ``Accept-Encoding`` request header.
+"""
+
+JSONSCHEMAS_IMMUTABLE_PATHS = None
+r"""Regular expression matching the schema paths which never change.
+
+Responses for the matching schemas are sent with a long-lived
+``Cache-Control`` header, allowing browsers and proxies to cache them without
+revalidation. For example, to match versioned schemas such as
+``records/record-v1.0.0.json``:
+
+.. code-block:: python
+
+    JSONSCHEMAS_IMMUTABLE_PATHS = r"-v\d+\.\d+\.\d+\.json$"
 """
 
+JSONSCHEMAS_IMMUTABLE_MAX_AGE = 31536000
+"""Max age in seconds of the responses for immutable schemas."""
+
+JSONSCHEMAS_URL_ALIASES = []
+"""Other URL prefixes the schemas are referred to with.
+
+The schema path is appended to each prefix, e.g. with
+``["http://legacy.example.org/schemas"]``, the URL
+``http://legacy.example.org/schemas/records/record-v1.0.0.json`` is converted
+to the path ``records/record-v1.0.0.json``.
+"""
+
+JSONSCHEMAS_URL_MEMO_SIZE = 1000
+"""Maximum number of URLs outside of the index whose path is remembered."""
+
 JSONSCHEMAS_REGISTER_ENDPOINTS_API = True
 """Register the endpoints on the API app."""
 
@@ -62,5 +163,87 @@ For example, if you only want to register `foo` and skip `bar` schemas:
     JSONSCHEMAS_SCHEMAS = ['foo']
 """
 
+JSONSCHEMAS_INDEX_FILE = None
+"""Path of the index of the registered schemas.
+
+If set, the schemas are registered from this file at startup instead of
+scanning the directories of all the ``invenio_jsonschemas.schemas`` entry
+points. The index is built with ``invenio jsonschemas index`` and ignored when
+the installed entry points change.
+"""
+
+JSONSCHEMAS_EAGER_LOAD = False
+"""Load all the schemas of the entry points when initializing the app.
+
+By default, the directories of the entry points are scanned on the first
+lookup and each schema is parsed when first requested. When enabled, the
+directories are scanned and all the schema files parsed in parallel at
+startup, so that duplicate schemas and ``$id`` not matching their path are
+reported right away. See
+:meth:`invenio_jsonschemas.ext.InvenioJSONSchemasState.load_schemas_dirs`.
+"""
+
+JSONSCHEMAS_EAGER_LOAD_THREADS = None
+"""Number of threads scanning and parsing the schemas in eager load mode.
+
+If ``None``, a single thread is used. See
+:py:const:`invenio_jsonschemas.config.JSONSCHEMAS_EAGER_LOAD`.
+"""
+
+JSONSCHEMAS_WARM_ON_INIT = False
+"""Load all the registered schemas in the caches when initializing the app.
+
+See :meth:`invenio_jsonschemas.ext.InvenioJSONSchemasState.warm`. When the
+application is preloaded before the server forks its workers, they share the
+loaded schemas.
+"""
+
+JSONSCHEMAS_METRICS = False
+"""Collect metrics about the schema caches, operations and requests.
+
+See :class:`invenio_jsonschemas.metrics.SchemaMetrics`. The underlying
+signals, in :mod:`invenio_jsonschemas.signals`, are always sent.
+"""
+
+JSONSCHEMAS_METRICS_URL = None
+"""URL rule serving the metrics in the Prometheus text format, if set.
+
+For example ``"/metrics/jsonschemas"``. Requires
+:py:const:`invenio_jsonschemas.config.JSONSCHEMAS_METRICS`.
+"""
+
+JSONSCHEMAS_WATCH = False
+"""Reload the schemas when their files are added, removed or modified.
+
+Meant for development: a background thread polls the directories of the
+registered schemas, see :class:`invenio_jsonschemas.watcher.SchemaWatcher`.
+"""
+
+JSONSCHEMAS_WATCH_INTERVAL = 1.0
+"""Seconds between two polls of the schema directories when watching them."""
+
+JSONSCHEMAS_PARSED_CACHE_DIR = None
+"""Directory caching the parsed schema files between processes, if set.
+
+Parsed schemas are stored in a format faster to load than JSON, and parsed
+again when their file is modified. See
+:class:`invenio_jsonschemas.cache.ParsedSchemaCache`.
+"""
+
+JSONSCHEMAS_SHARED_CACHE_FILE = None
+"""Path of a file caching the schemas for all the processes of a host.
+
+The file is built with ``invenio jsonschemas warm --shared-cache <file>`` and
+memory-mapped by each process, which then reads the schemas, with replaced
+``$ref`` and resolved, from it instead of loading them. As ``$ref`` are
+replaced relative to the canonical URL of the schemas, whatever the URL they
+are requested at, the variants in the file serve all the requests. The file is
+ignored if the registered schemas differ from the ones it was built with.
+
+Only the serialized schemas are shared: they are served without being copied
+or parsed. Each process still parses the schemas it needs as Python objects,
+e.g. to validate records, once, and keeps them in its own cache.
+"""
+
 JSONSCHEMAS_LOCAL_REFRESOLVER_URI_SCHEME = "local://"
 """Non-standard URI scheme to reference local schemas."""
@@ -43,3 +43,23 @@ class JSONSchemaDuplicate(JSONSchemaError):
             *args,
             **kwargs,
         )
+
+
+class JSONSchemaIdMismatch(JSONSchemaError):
+    """Exception raised when the ``$id`` of a schema does not match its path."""
+
+    def __init__(self, schema, schema_id, uri, *args, **kwargs):
+        """Constructor.
+
+        :param schema: path of the schema.
+        :param schema_id: ``$id`` of the schema.
+        :param uri: local URI of the schema.
+        """
+        self.schema = schema
+        super(JSONSchemaIdMismatch, self).__init__(
+            "Schema {schema} has $id {schema_id} instead of {uri}".format(
+                schema=schema, schema_id=schema_id, uri=uri
+            ),
+            *args,
+            **kwargs,
+        )
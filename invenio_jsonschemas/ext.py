@@ -7,25 +7,86 @@
 
 from __future__ import absolute_import, print_function
 
+import asyncio
+import hashlib
 import json
 import os
-from urllib.parse import urlsplit
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
 
-from flask import request
+from flask import copy_current_request_context, has_request_context
+from flask.json.provider import DefaultJSONProvider
 from invenio_base.utils import entry_points
 from jsonref import JsonRef
+from jsonschema.validators import validator_for
+from referencing import Registry, Resource
+from referencing.exceptions import NoSuchResource
 from werkzeug.exceptions import HTTPException
 from werkzeug.routing import Map, Rule
 from werkzeug.utils import cached_property, import_string
 
 from . import config
-from .errors import JSONSchemaDuplicate, JSONSchemaNotFound
-from .views import create_blueprint
+from .bundle import write_bundle
+from .cache import (
+    COMPRESSORS,
+    LRUCache,
+    ParsedSchemaCache,
+    SerializedSchema,
+    SharedSchemaCache,
+    SingleFlight,
+)
+from .errors import JSONSchemaDuplicate, JSONSchemaIdMismatch, JSONSchemaNotFound
+from .graph import DependencyGraph, iter_refs
+from .index import read_index
+from .metrics import PROMETHEUS_CONTENT_TYPE, SchemaMetrics
+from .signals import (
+    refresolver_store_built,
+    refs_replaced,
+    schema_loaded,
+    schema_resolved,
+    schema_serialized,
+)
+from .utils import entry_point_directory, freeze
+from .validation import iter_validate, validator_specification, with_base_uri
+from .views import create_async_blueprint, create_blueprint
+from .watcher import SchemaWatcher
 
-try:
-    from functools import lru_cache
-except ImportError:
-    from functools32 import lru_cache
+_MISSING = object()
+"""Marker of cache misses."""
+
+
+def _variants(with_refs, resolved):
+    """List the ``(with_refs, resolved)`` variants of a schema."""
+    variants = [(False, False)]
+    if with_refs:
+        variants.append((True, False))
+    if resolved:
+        variants.append((True, True))
+    return variants
+
+
+def _cached(cache, key):
+    """Get a cached value, or ``None`` without counting a miss."""
+    return cache.get(key) if key in cache else None
+
+
+def _scan_schemas_dir(directory):
+    """List the paths of the schema files of a directory, recursively."""
+    paths = []
+    dir_paths = [""]
+    while dir_paths:
+        dir_path = dir_paths.pop()
+        with os.scandir(os.path.join(directory, dir_path)) as entries:
+            for entry in entries:
+                path = os.path.join(dir_path, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    dir_paths.append(path)
+                elif entry.name.lower().endswith(".json"):
+                    paths.append(path)
+    return sorted(paths)
 
 
 class InvenioJSONSchemasState(object):
@@ -37,7 +98,36 @@ class InvenioJSONSchemasState(object):
         :param app: application registering this state
         """
         self.app = app
-        self.schemas = {}
+        #: The ``invenio_jsonschemas.schemas`` entry points to register the
+        #: schemas of, see :meth:`register_entry_points`.
+        self.entry_points = []
+        self._schemas = {}
+        self._pending_directories = []
+        self._registration_lock = threading.RLock()
+        self._registering = False
+        self._registration_error = None
+        #: The :class:`invenio_jsonschemas.watcher.SchemaWatcher`, if enabled.
+        self.watcher = None
+        #: The :class:`invenio_jsonschemas.metrics.SchemaMetrics`, if enabled.
+        self.metrics = None
+        self._refresolver_store = None
+        self._refresolver_store_view = None
+        self._dependency_graph = DependencyGraph()
+        self._dependency_graph_complete = False
+        self._url_index = None
+        self._path_urls = {}
+        self._url_memo = LRUCache(app.config["JSONSCHEMAS_URL_MEMO_SIZE"])
+        #: Cache of the loaded schemas, see :meth:`get_schema`.
+        self.schema_cache = LRUCache(app.config["JSONSCHEMAS_SCHEMA_CACHE_SIZE"])
+        #: Cache of the entity tags, see :meth:`get_schema_etag`.
+        self.etag_cache = LRUCache(app.config["JSONSCHEMAS_SCHEMA_CACHE_SIZE"])
+        #: Cache of the encoded schemas, see :meth:`get_serialized_schema`.
+        self.response_cache = LRUCache(app.config["JSONSCHEMAS_RESPONSE_CACHE_SIZE"])
+        self._validators = {}
+        self._resources = {}
+        self._single_flight = SingleFlight()
+        self._async_calls = {}
+        self._async_lock = threading.Lock()
         self.url_map = Map(
             [
                 Rule(
@@ -49,6 +139,40 @@ class InvenioJSONSchemasState(object):
             host_matching=True,
         )
 
+    @property
+    def schemas(self):
+        """Mapping of the registered schema paths to their root directory.
+
+        The directories of the entry points are scanned on first access, see
+        :meth:`register_entry_points`.
+
+        :raises invenio_jsonschemas.errors.JSONSchemaDuplicate: On every
+            access, if two entry points define the same schema.
+        """
+        if self._pending_directories:
+            self._register_pending_directories()
+        return self._schemas
+
+    def _register_pending_directories(self):
+        """Scan the directories of the entry points not registered yet."""
+        with self._registration_lock:
+            # the registration itself reads the schemas
+            if self._registering:
+                return
+            if self._registration_error is not None:
+                # never serve a partially registered set of schemas
+                raise self._registration_error
+            self._registering = True
+            try:
+                while self._pending_directories:
+                    self.register_schemas_dir(self._pending_directories[0])
+                    self._pending_directories.pop(0)
+            except JSONSchemaDuplicate as e:
+                self._registration_error = e
+                raise
+            finally:
+                self._registering = False
+
     def register_schemas_dir(self, directory):
         """Recursively register all json-schemas in a directory.
 
@@ -66,6 +190,98 @@ class InvenioJSONSchemasState(object):
                             schema_name, self.schemas[schema_name], directory
                         )
                     self.schemas[schema_name] = os.path.abspath(directory)
+                    self._schema_registered(schema_name)
+
+    def register_entry_points(self, use_index=True):
+        """Register the schemas of the :attr:`entry_points`.
+
+        The schema packages are not imported, and their directories are
+        scanned on the first access to :attr:`schemas`. If two of them define
+        the same schema, every access raises
+        :class:`invenio_jsonschemas.errors.JSONSchemaDuplicate`.
+
+        If :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_INDEX_FILE` is
+        set and up to date, the schemas are registered from it instead of
+        scanning the directories of the entry points.
+
+        :param use_index: use the index file, if any.
+        """
+        index_file = self.app.config["JSONSCHEMAS_INDEX_FILE"]
+        if use_index and index_file:
+            schemas = read_index(index_file, self.entry_points)
+            if schemas is not None:
+                self.schemas.update(schemas)
+                return
+            self.app.logger.warning(
+                "JSONSchemas index {0} is missing or outdated".format(index_file)
+            )
+        directories = [
+            entry_point_directory(base_entry) for base_entry in self.entry_points
+        ]
+        if self.app.config["JSONSCHEMAS_EAGER_LOAD"]:
+            errors = self.load_schemas_dirs(
+                directories, threads=self.app.config["JSONSCHEMAS_EAGER_LOAD_THREADS"]
+            )
+            for path, error in errors:
+                self.app.logger.warning(
+                    "Could not load schema {0}: {1}".format(path, error)
+                )
+        else:
+            # the packages are located without being imported, and their
+            # directories scanned only when the schemas are first needed
+            self._pending_directories.extend(directories)
+
+    def load_schemas_dirs(self, directories, threads=None):
+        """Register and load all the json-schemas of several directories.
+
+        The directories are scanned and the schema files parsed in parallel.
+        Each schema is then checked, its parsed content and entity tag cached,
+        and, if all of them are valid, the ref resolver store is built.
+
+        :param directories: directory paths, in order of precedence.
+        :param threads: number of threads scanning and parsing the files.
+        :raises invenio_jsonschemas.errors.JSONSchemaDuplicate: If two
+            directories define the same schema. No schema is registered then.
+        :returns: list of ``(path, exception)`` for the schemas which failed to
+            load, such as
+            :class:`invenio_jsonschemas.errors.JSONSchemaIdMismatch`.
+        """
+        with ThreadPoolExecutor(max_workers=threads or 1) as executor:
+            found = {}
+            for directory, paths in zip(
+                directories, executor.map(_scan_schemas_dir, directories)
+            ):
+                for path in paths:
+                    first_dir = self.schemas.get(path, found.get(path))
+                    if first_dir is not None:
+                        raise JSONSchemaDuplicate(path, first_dir, directory)
+                    found[path] = os.path.abspath(directory)
+            for path, directory in found.items():
+                self.schemas[path] = directory
+                self._schema_registered(path)
+            results = executor.map(self._load_schema_file, list(found))
+            errors = [result for result in results if result is not None]
+        if not errors:
+            self.refresolver_store()
+        return errors
+
+    def _load_schema_file(self, path):
+        """Parse a schema file and cache its content and entity tag."""
+        try:
+            start = time.perf_counter()
+            with open(os.path.join(self.schemas[path], path), "rb") as file_:
+                data = file_.read()
+            schema = freeze(json.loads(data))
+            self._timed(schema_loaded, path, start)
+            self._record_dependencies(path, schema)
+            uri = self._local_uri(path)
+            if schema.get("$id") and schema["$id"] != uri:
+                raise JSONSchemaIdMismatch(path, schema["$id"], uri)
+        except Exception as e:
+            return path, e
+        key = self._cache_key(path, False, False)
+        self.schema_cache.set(key, schema)
+        self.etag_cache.set(key, hashlib.sha256(data).hexdigest())
 
     def register_schema(self, directory, path):
         """Register a json-schema.
@@ -74,6 +290,31 @@ class InvenioJSONSchemasState(object):
         :param path: schema path, relative to the root directory.
         """
         self.schemas[path] = os.path.abspath(directory)
+        self._schema_registered(path)
+
+    def unregister_schema(self, path):
+        """Unregister a json-schema.
+
+        The schema and the schemas referencing it are evicted from the caches.
+
+        :param path: schema path, relative to its root directory.
+        :raises invenio_jsonschemas.errors.JSONSchemaNotFound: If the schema
+            is not registered.
+        """
+        if path not in self.schemas:
+            raise JSONSchemaNotFound(path)
+        self.__dict__.pop("shared_cache", None)
+        self._invalidate(path)
+        if self._url_index is not None:
+            for url in self._schema_urls(path):
+                self._url_index.pop(url, None)
+        self._path_urls.pop(path, None)
+        self._url_memo.clear()
+        del self.schemas[path]
+        self._dependency_graph.remove(path)
+        if self._refresolver_store is not None:
+            uri_scheme = self.app.config["JSONSCHEMAS_LOCAL_REFRESOLVER_URI_SCHEME"]
+            self._refresolver_store.pop(uri_scheme + path.lstrip("/"), None)
 
     def get_schema_dir(self, path):
         """Retrieve the directory containing the given schema.
@@ -100,31 +341,599 @@ class InvenioJSONSchemasState(object):
             raise JSONSchemaNotFound(path)
         return os.path.join(self.schemas[path], path)
 
-    @lru_cache(maxsize=1000)
     def get_schema(self, path, with_refs=False, resolved=False):
         """Retrieve a schema.
 
+        Schemas are cached in :attr:`schema_cache`, whose size is set by
+        :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_SCHEMA_CACHE_SIZE`.
+        As they are shared, they are returned read-only. Use
+        :func:`copy.deepcopy` to get a mutable copy. When several threads
+        request the same schema which is not cached, it is loaded once and
+        all of them get the result, or the error.
+
         :param path: schema's relative path.
-        :param with_refs: replace $refs in the schema.
+        :param with_refs: replace $refs in the schema, relative to its
+            canonical URL (see :meth:`path_to_url`).
         :param resolved: resolve schema using the resolver
             :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_RESOLVER_CLS`
         :raises invenio_jsonschemas.errors.JSONSchemaNotFound: If no schema
             was found in the specified path.
-        :returns: The schema in a dictionary form.
+        :returns: The schema as a
+            :class:`invenio_jsonschemas.utils.FrozenDict`.
         """
         if path not in self.schemas:
             raise JSONSchemaNotFound(path)
-        with open(os.path.join(self.schemas[path], path)) as file_:
-            schema = json.load(file_)
-            if with_refs:
-                schema = JsonRef.replace_refs(
-                    schema,
-                    base_uri=request.base_url,
-                    loader=self.loader_cls() if self.loader_cls else None,
-                )
-            if resolved:
-                schema = self.resolver_cls(schema)
+        key = self._cache_key(path, with_refs, resolved)
+        schema = self.schema_cache.get(key, _MISSING)
+        if schema is _MISSING:
+            schema = self._single_flight.do(
+                ("schema",) + key,
+                lambda: self._compute_schema(key),
+                lambda: _cached(self.schema_cache, key),
+            )
+        return schema
+
+    def _compute_schema(self, key):
+        """Load a schema which is not cached and cache it."""
+        shared = self.shared_cache and self.shared_cache.get(*key[:4])
+        if shared:
+            # only the serialized schemas are shared, each process parses the
+            # ones it needs once
+            schema = freeze(json.loads(shared.data.tobytes()))
+            if not key[1]:
+                self._record_dependencies(key[0], schema)
+        else:
+            schema = self._load_schema(*key[:4])
+        if key[1]:
+            # the schema embeds its dependencies, which need to be known to
+            # evict it when one of them changes
+            self._record_transitive_dependencies(key[0])
+        self.schema_cache.set(key, schema)
+        return schema
+
+    def get_schema_etag(self, path, with_refs=False, resolved=False):
+        """Retrieve the entity tag of a schema.
+
+        The tag is a hash of the schema file, or of the schema content when
+        ``with_refs`` or ``resolved`` are set. It is computed once and cached
+        in :attr:`etag_cache`.
+
+        :param path: schema's relative path.
+        :param with_refs: replace $refs in the schema.
+        :param resolved: resolve schema using the resolver.
+        :raises invenio_jsonschemas.errors.JSONSchemaNotFound: If no schema
+            was found in the specified path.
+        :returns: The entity tag.
+        """
+        if path not in self.schemas:
+            raise JSONSchemaNotFound(path)
+        key = self._cache_key(path, with_refs, resolved)
+        etag = self.etag_cache.get(key)
+        if etag is None:
+            shared = self.shared_cache and self.shared_cache.get(*key[:4])
+            if shared:
+                etag = shared.etag
+            elif with_refs or resolved:
+                etag = self.get_serialized_schema(
+                    path, with_refs=with_refs, resolved=resolved, streamed=True
+                ).etag
+            else:
+                etag = self._file_etag(path)
+            self.etag_cache.set(key, etag)
+        return etag
+
+    async def get_schema_async(self, path, with_refs=False, resolved=False):
+        """Retrieve a schema without blocking the event loop.
+
+        Cached schemas are returned immediately. Otherwise the schema is
+        loaded by :meth:`get_schema` in the :attr:`executor`, and concurrent
+        calls for the same schema wait for the same load.
+
+        :returns: The schema as a
+            :class:`invenio_jsonschemas.utils.FrozenDict`.
+        """
+        if path not in self.schemas:
+            raise JSONSchemaNotFound(path)
+        key = self._cache_key(path, with_refs, resolved)
+        schema = self.schema_cache.get(key, _MISSING)
+        if schema is not _MISSING:
             return schema
+        return await self._run_async(
+            ("schema",) + key, self.get_schema, path, with_refs, resolved
+        )
+
+    async def get_schema_etag_async(self, path, with_refs=False, resolved=False):
+        """Retrieve the entity tag of a schema without blocking the event loop.
+
+        See :meth:`get_schema_etag` and :meth:`get_schema_async`.
+
+        :returns: The entity tag.
+        """
+        if path not in self.schemas:
+            raise JSONSchemaNotFound(path)
+        key = self._cache_key(path, with_refs, resolved)
+        etag = self.etag_cache.get(key)
+        if etag is not None:
+            return etag
+        return await self._run_async(
+            ("etag",) + key, self.get_schema_etag, path, with_refs, resolved
+        )
+
+    async def get_serialized_schema_async(
+        self, path, with_refs=False, resolved=False, streamed=False
+    ):
+        """Retrieve a serialized schema without blocking the event loop.
+
+        See :meth:`get_serialized_schema` and :meth:`get_schema_async`.
+
+        :returns: A :class:`invenio_jsonschemas.cache.SerializedSchema`.
+        """
+        if path not in self.schemas:
+            raise JSONSchemaNotFound(path)
+        key = self._cache_key(path, with_refs, resolved)
+        serialized = self.response_cache.get(key)
+        if serialized is not None and (streamed or serialized.data is not None):
+            return serialized
+        return await self._run_async(
+            ("streamed" if streamed else "serialized",) + key,
+            self.get_serialized_schema,
+            path,
+            with_refs,
+            resolved,
+            streamed,
+        )
+
+    def _run_async(self, key, func, *args):
+        """Run a function in the executor, sharing the calls with the same key.
+
+        The function runs in a copy of the current request context, or in the
+        application context outside of requests.
+        """
+        with self._async_lock:
+            future = self._async_calls.get(key)
+            submitted = future is None
+            if submitted:
+                if has_request_context():
+                    func = copy_current_request_context(func)
+                else:
+                    func = self._with_app_context(func)
+                future = self._async_calls[key] = self.executor.submit(func, *args)
+
+        def forget(done):
+            with self._async_lock:
+                if self._async_calls.get(key) is done:
+                    del self._async_calls[key]
+
+        if submitted:
+            future.add_done_callback(forget)
+        return asyncio.wrap_future(future)
+
+    def _with_app_context(self, func):
+        """Wrap a function to run it in the application context."""
+
+        def wrapper(*args):
+            with self.app.app_context():
+                return func(*args)
+
+        return wrapper
+
+    @cached_property
+    def executor(self):
+        """Executor loading the schemas for the asynchronous methods.
+
+        Its size is set by
+        :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_ASYNC_WORKERS`.
+        """
+        return ThreadPoolExecutor(
+            max_workers=self.app.config["JSONSCHEMAS_ASYNC_WORKERS"],
+            thread_name_prefix="invenio-jsonschemas",
+        )
+
+    def _file_etag(self, path):
+        """Compute the entity tag of a schema file."""
+        with open(os.path.join(self.schemas[path], path), "rb") as file_:
+            return hashlib.sha256(file_.read()).hexdigest()
+
+    def get_serialized_schema(
+        self, path, with_refs=False, resolved=False, streamed=False
+    ):
+        """Retrieve a schema encoded as a JSON document.
+
+        The encoded schema, as well as its compressed versions for the
+        :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_PRECOMPRESS_ENCODINGS`,
+        are cached in :attr:`response_cache`, unless they are read from the
+        :attr:`shared_cache`.
+
+        :param path: schema's relative path.
+        :param with_refs: replace $refs in the schema.
+        :param resolved: resolve schema using the resolver.
+        :param streamed: if :attr:`streaming` is enabled, only keep the
+            entity tag of the schemas larger than
+            :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_STREAM_MIN_SIZE`.
+            Their data is then ``None``, and they are meant to be sent with
+            :meth:`iterencode`.
+        :raises invenio_jsonschemas.errors.JSONSchemaNotFound: If no schema
+            was found in the specified path.
+        :returns: A :class:`invenio_jsonschemas.cache.SerializedSchema`.
+        """
+        if path not in self.schemas:
+            raise JSONSchemaNotFound(path)
+        key = self._cache_key(path, with_refs, resolved)
+        serialized = self.response_cache.get(key)
+        if serialized is not None and serialized.data is None and not streamed:
+            # only the entity tag of the streamed schemas is cached
+            serialized = None
+        if serialized is None:
+            shared = self.shared_cache and self.shared_cache.get(*key[:4])
+            if shared:
+                return shared
+            if streamed and self.streaming:
+                serialized = self._single_flight.do(
+                    ("streamed",) + key,
+                    lambda: self._compute_streamed_schema(key),
+                    lambda: _cached(self.response_cache, key),
+                )
+            else:
+                serialized = self._single_flight.do(
+                    ("serialized",) + key,
+                    lambda: self._compute_serialized_schema(key),
+                    lambda: self._cached_serialized_schema(key),
+                )
+        return serialized
+
+    def _cached_serialized_schema(self, key):
+        """Get a cached serialized schema, unless only its entity tag is."""
+        serialized = _cached(self.response_cache, key)
+        return serialized if serialized and serialized.data is not None else None
+
+    def _compute_serialized_schema(self, key):
+        """Serialize a schema which is not cached and cache it."""
+        path, with_refs, resolved = key[:3]
+        serialized = self._serialize(
+            self.get_schema(path, with_refs=with_refs, resolved=resolved), path
+        )
+        self.response_cache.set(key, serialized)
+        return serialized
+
+    def _compute_streamed_schema(self, key):
+        """Encode a schema which is not cached in chunks and cache it.
+
+        The chunks are hashed and kept in a single pass, until they exceed
+        :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_STREAM_MIN_SIZE`.
+        Larger schemas are cached without their data.
+        """
+        path, with_refs, resolved = key[:3]
+        schema = self.get_schema(path, with_refs=with_refs, resolved=resolved)
+        start = time.perf_counter()
+        max_size = self.app.config["JSONSCHEMAS_STREAM_MIN_SIZE"]
+        digest, chunks, size = hashlib.sha256(), [], 0
+        for chunk in self.iterencode(schema):
+            digest.update(chunk)
+            size += len(chunk)
+            if chunks is not None and size <= max_size:
+                chunks.append(chunk)
+            else:
+                chunks = None
+        if chunks is None:
+            serialized = SerializedSchema(None, digest.hexdigest(), {})
+            schema_serialized.send(
+                self, path=path, duration=time.perf_counter() - start, size=size
+            )
+        else:
+            serialized = self._serialized(b"".join(chunks), path, start)
+        self.response_cache.set(key, serialized)
+        return serialized
+
+    def _serialize(self, schema, path=None):
+        """Encode a schema as it is sent in responses."""
+        start = time.perf_counter()
+        return self._serialized(self.app.json.response(schema).get_data(), path, start)
+
+    def _serialized(self, data, path, start):
+        """Build the serialized schema of encoded data, and compress it."""
+        serialized = SerializedSchema(
+            data,
+            hashlib.sha256(data).hexdigest(),
+            {
+                encoding: COMPRESSORS[encoding](data)
+                for encoding in self.precompress_encodings
+            },
+        )
+        schema_serialized.send(
+            self, path=path, duration=time.perf_counter() - start, size=len(data)
+        )
+        return serialized
+
+    @property
+    def streaming(self):
+        """Whether the large schemas with replaced ``$ref`` or resolved are streamed.
+
+        See :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_STREAM_CHUNK_SIZE`.
+        Schemas are only streamed with the default JSON provider of Flask, as
+        the chunks must be the same as its encoding.
+        """
+        provider = type(self.app.json)
+        return bool(self.app.config["JSONSCHEMAS_STREAM_CHUNK_SIZE"]) and (
+            getattr(provider, "dumps", None) is DefaultJSONProvider.dumps
+            and getattr(provider, "response", None) is DefaultJSONProvider.response
+        )
+
+    def iterencode(self, schema):
+        """Encode a schema as it is sent in responses, chunk by chunk.
+
+        The concatenated chunks are the same as the data of
+        :meth:`get_serialized_schema`, but only about
+        :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_STREAM_CHUNK_SIZE`
+        bytes are held in memory at a time. Requires :attr:`streaming`.
+
+        :param schema: the schema to encode.
+        :returns: An iterator over the encoded chunks.
+        """
+        chunk_size = self.app.config["JSONSCHEMAS_STREAM_CHUNK_SIZE"]
+        provider = self.app.json
+        if (provider.compact is None and self.app.debug) or provider.compact is False:
+            separators = {"indent": 2}
+        else:
+            separators = {"separators": (",", ":")}
+        encoder = json.JSONEncoder(
+            default=provider.default,
+            ensure_ascii=provider.ensure_ascii,
+            sort_keys=provider.sort_keys,
+            **separators,
+        )
+        parts, size = [], 0
+        for part in encoder.iterencode(schema):
+            parts.append(part)
+            size += len(part)
+            if size >= chunk_size:
+                yield "".join(parts).encode("utf-8")
+                parts, size = [], 0
+        parts.append("\n")
+        yield "".join(parts).encode("utf-8")
+
+    @cached_property
+    def shared_cache(self):
+        """Cache shared between processes, or ``None`` if not configured.
+
+        See :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_SHARED_CACHE_FILE`.
+        """
+        filename = self.app.config["JSONSCHEMAS_SHARED_CACHE_FILE"]
+        if not filename:
+            return None
+        try:
+            cache = SharedSchemaCache(filename)
+        except (OSError, ValueError) as e:
+            self.app.logger.warning("Cannot open schemas cache: {0}".format(e))
+            return None
+        if cache.schemas != self.schemas:
+            self.app.logger.warning("Schemas cache {0} is outdated".format(filename))
+            return None
+        return cache
+
+    def write_shared_cache(self, filename, with_refs=True, resolved=True):
+        """Write the cache shared between processes.
+
+        All the registered schemas are loaded from their files, see
+        :meth:`warm`, and written to a file which can then be used as
+        :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_SHARED_CACHE_FILE`.
+
+        :param filename: path of the cache file.
+        :param with_refs: also write the schemas with replaced ``$ref``.
+        :param resolved: also write the resolved schemas.
+        """
+
+        def variants():
+            for path in self.schemas:
+                with self.app.app_context():
+                    for with_refs_, resolved_ in _variants(with_refs, resolved):
+                        base_uri = self._cache_key(path, with_refs_, resolved_)[3]
+                        schema = self._load_schema(
+                            path, with_refs_, resolved_, base_uri
+                        )
+                        serialized = self._serialize(schema, path)
+                        if not with_refs_:
+                            serialized = serialized._replace(etag=self._file_etag(path))
+                        yield path, with_refs_, resolved_, base_uri, serialized
+
+        SharedSchemaCache.write(filename, self.schemas, variants())
+
+    def _cache_key(self, path, with_refs, resolved):
+        """Build the key identifying a variant of a schema in the caches."""
+        # the $ref are replaced relative to the canonical URL of the schema,
+        # whatever the URL of the current request
+        base_uri = self.path_to_url(path) if with_refs else None
+        return (path, bool(with_refs), bool(resolved), base_uri, self.loader_cls)
+
+    def _load_schema(self, path, with_refs, resolved, base_uri):
+        """Load a schema from its file."""
+        start = time.perf_counter()
+        schema = self._parse_schema_file(os.path.join(self.schemas[path], path))
+        start = self._timed(schema_loaded, path, start)
+        self._record_dependencies(path, schema)
+        if with_refs and self.ref_expander_cls:
+            schema = self.ref_expander_cls(
+                self,
+                max_inline_depth=self.app.config["JSONSCHEMAS_REF_EXPANSION_MAX_DEPTH"],
+            ).expand(schema, base_uri=base_uri)
+            start = self._timed(refs_replaced, path, start)
+        elif with_refs:
+            schema = JsonRef.replace_refs(
+                schema,
+                base_uri=base_uri,
+                loader=self.loader_cls() if self.loader_cls else None,
+            )
+        if resolved:
+            schema = self.resolver_cls(schema)
+            start = self._timed(schema_resolved, path, start)
+        schema = freeze(schema)
+        if with_refs and not resolved and not self.ref_expander_cls:
+            # JsonRef loads the referenced schemas lazily, while freezing
+            self._timed(refs_replaced, path, start)
+        return schema
+
+    def _timed(self, signal, path, start):
+        """Send a signal with the duration of an operation.
+
+        :returns: The end time of the operation.
+        """
+        end = time.perf_counter()
+        signal.send(self, path=path, duration=end - start)
+        return end
+
+    def _parse_schema_file(self, filename):
+        """Parse a schema file, or get it from the :attr:`parsed_cache`."""
+        if self.parsed_cache is not None:
+            schema = self.parsed_cache.get(filename, _MISSING)
+            if schema is not _MISSING:
+                return schema
+            stat = os.stat(filename)
+        with open(filename) as file_:
+            schema = json.load(file_)
+        if self.parsed_cache is not None:
+            self.parsed_cache.set(filename, schema, stat)
+        return schema
+
+    @cached_property
+    def parsed_cache(self):
+        """Cache of the parsed schema files, or ``None`` if not configured.
+
+        See :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_PARSED_CACHE_DIR`.
+        """
+        directory = self.app.config["JSONSCHEMAS_PARSED_CACHE_DIR"]
+        return ParsedSchemaCache(directory) if directory else None
+
+    def warm(self, with_refs=True, resolved=True, threads=None):
+        """Load all the registered schemas in the caches.
+
+        Each schema is loaded, serialized and compiled into a validator, as
+        well as, optionally, with replaced ``$ref`` and resolved. If all of
+        them could be loaded, the ref resolver store is built. The ``$ref``
+        are replaced relative to the canonical URL of the schemas, see
+        :meth:`path_to_url`, so the loaded schemas serve the requests from
+        any host, scheme or URL prefix.
+
+        Calling it before forking workers lets them share the loaded schemas.
+        The caches need to be large enough to hold all the schemas, see
+        :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_SCHEMA_CACHE_SIZE`.
+
+        :param with_refs: also load the schemas with replaced ``$ref``.
+        :param resolved: also load the resolved schemas.
+        :param threads: number of threads loading the schemas in parallel.
+        :returns: list of ``(path, exception)`` for the schemas which failed to
+            load.
+        """
+        variants = _variants(with_refs, resolved)
+
+        def warm_schema(path):
+            try:
+                with self.app.app_context():
+                    for with_refs, resolved in variants:
+                        self.get_schema_etag(path, with_refs, resolved)
+                        if with_refs or resolved:
+                            self.get_serialized_schema(path, with_refs, resolved)
+                    self.get_validator(path)
+            except Exception as e:
+                return path, e
+
+        with ThreadPoolExecutor(max_workers=threads or 1) as executor:
+            results = executor.map(warm_schema, list(self.schemas))
+            errors = [result for result in results if result is not None]
+        if not errors:
+            self.refresolver_store()
+        return errors
+
+    def clear_caches(self):
+        """Release all the cached schemas, validators and ref resolver store."""
+        self.schema_cache.clear()
+        self.etag_cache.clear()
+        self.response_cache.clear()
+        self.__dict__.pop("shared_cache", None)
+        self._validators.clear()
+        self._resources.clear()
+        self._refresolver_store = self._refresolver_store_view = None
+        self._dependency_graph = DependencyGraph()
+        self._dependency_graph_complete = False
+        self._url_index = None
+        self._path_urls.clear()
+        self._url_memo.clear()
+
+    def get_validator(self, path, draft=None):
+        """Retrieve a ready to use validator for a schema.
+
+        Validators are built once per schema and cached. References are
+        resolved relative to the URL of the schema, and references to other
+        registered schemas through the local ref resolver store, see
+        :meth:`refresolver_store`.
+
+        :param path: schema's relative path.
+        :param draft: jsonschema validator class to use (e.g.
+            ``jsonschema.Draft7Validator``). If ``None``, it is selected
+            from the ``$schema`` keyword of the schema.
+        :raises invenio_jsonschemas.errors.JSONSchemaNotFound: If no schema
+            was found in the specified path.
+        :returns: A jsonschema validator instance.
+        """
+        key = (path, draft)
+        validator = self._validators.get(key)
+        if validator is None:
+            schema = self.get_schema(path)
+            cls = draft or validator_for(schema)
+            specification = validator_specification(cls)
+            registry = Registry(
+                retrieve=lambda uri: self._retrieve_resource(uri, specification)
+            ).with_contents(
+                [(self._local_uri(path), schema)], default_specification=specification
+            )
+            # the relative references are resolved from the URL of the schema,
+            # even if it has no ``$id``
+            schema = with_base_uri(schema, cls, self.path_to_url(path))
+            self._record_transitive_dependencies(path)
+            validator = self._validators[key] = cls(schema, registry=registry)
+        return validator
+
+    def _retrieve_resource(self, uri, specification):
+        """Retrieve a registered schema referenced from a validated schema."""
+        path = self._ref_path(uri)
+        if path is None:
+            raise NoSuchResource(ref=uri)
+        # keyed by path, so that the resources of a schema are evicted at once
+        key = (path, specification)
+        if key not in self._resources:
+            store = self.refresolver_store()
+            local_uri = self._local_uri(path)
+            if local_uri not in store:
+                raise NoSuchResource(ref=uri)
+            self._resources[key] = Resource.from_contents(
+                store[local_uri], default_specification=specification
+            )
+        return self._resources[key]
+
+    def iter_validate(self, items, draft=None, processes=None, chunk_size=500):
+        """Validate many records against their schemas.
+
+        See :func:`invenio_jsonschemas.validation.iter_validate`.
+
+        :param items: iterable of ``(schema_url, record)`` pairs.
+        :returns: iterator of
+            :class:`invenio_jsonschemas.validation.ValidationResult`.
+        """
+        return iter_validate(
+            self, items, draft=draft, processes=processes, chunk_size=chunk_size
+        )
+
+    def export_bundle(
+        self, output, paths=None, variants=("resolved",), single_file=False
+    ):
+        """Write schemas to static files named after their content.
+
+        See :func:`invenio_jsonschemas.bundle.write_bundle`.
+
+        :param output: output directory.
+        :returns: The manifest of the written files.
+        """
+        return write_bundle(
+            self, output, paths=paths, variants=variants, single_file=single_file
+        )
 
     def list_schemas(self):
         """List all JSON-schema names.
@@ -137,10 +946,48 @@ class InvenioJSONSchemasState(object):
     def url_to_path(self, url):
         """Convert schema URL to path.
 
+        The URLs of the registered schemas, with the ``http`` and ``https``
+        schemes and the prefixes of
+        :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_URL_ALIASES`, are
+        looked up in an index. Other URLs, e.g. with a query string, are
+        matched against the schema endpoint and remembered.
+
         :param url: The schema URL.
         :returns: The schema path or ``None`` if the schema can't be resolved.
         """
+        path = self._get_url_index().get(url)
+        if path is None or path not in self.schemas:
+            path = self._url_memo.get(url, _MISSING)
+            if path is _MISSING:
+                path = self._match_url(url)
+                self._url_memo.set(url, path)
+        return path
+
+    def urls_to_paths(self, urls):
+        """Convert many schema URLs to paths.
+
+        :param urls: iterable of schema URLs.
+        :returns: A dictionary mapping each URL to its schema path, or to
+            ``None`` if the schema can't be resolved.
+        """
+        index = self._get_url_index()
+        paths = {}
+        for url in urls:
+            if url not in paths:
+                path = index.get(url)
+                if path is None or path not in self.schemas:
+                    path = self.url_to_path(url)
+                paths[url] = path
+        return paths
+
+    def _match_url(self, url):
+        """Match a URL which is not in the index."""
         parts = urlsplit(url)
+        path = self._get_url_index().get(
+            urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+        )
+        if path in self.schemas:
+            return path
         try:
             loader, args = self.url_map.bind(parts.netloc).match(parts.path)
             path = args.get("path")
@@ -157,10 +1004,52 @@ class InvenioJSONSchemasState(object):
         """
         if path not in self.schemas:
             return None
+        url = self._path_urls.get(path)
+        if url is None:
+            url = self._path_urls[path] = self._url_adapter.build(
+                "schema", values={"path": path}, force_external=True
+            )
+        return url
+
+    @cached_property
+    def _url_adapter(self):
+        """URL adapter building the canonical URLs of the schemas."""
         return self.url_map.bind(
             self.app.config["JSONSCHEMAS_HOST"],
             url_scheme=self.app.config["JSONSCHEMAS_URL_SCHEME"],
-        ).build("schema", values={"path": path}, force_external=True)
+        )
+
+    def url_index(self):
+        """Index of the URLs of the registered schemas.
+
+        The index is built once, on first access, and then kept up to date
+        when schemas are registered.
+
+        :returns: A read-only mapping of URLs to schema paths.
+        """
+        return MappingProxyType(self._get_url_index())
+
+    def _get_url_index(self):
+        """Get the index of the URLs, building it if needed."""
+        if self._url_index is None:
+            index = {}
+            for path in list(self.schemas):
+                index.update(dict.fromkeys(self._schema_urls(path), path))
+            self._url_index = index
+        return self._url_index
+
+    def _schema_urls(self, path):
+        """List the URLs a registered schema can be referred to with."""
+        parts = urlsplit(self.path_to_url(path))
+        schemes = {parts.scheme, "http", "https"}
+        urls = [
+            urlunsplit((scheme, parts.netloc, parts.path, "", "")) for scheme in schemes
+        ]
+        endpoint = self.app.config["JSONSCHEMAS_ENDPOINT"].rstrip("/") + "/"
+        relative_url = parts.path[len(endpoint) :]
+        for alias in self.app.config["JSONSCHEMAS_URL_ALIASES"]:
+            urls.append(alias.rstrip("/") + "/" + relative_url)
+        return urls
 
     @cached_property
     def loader_cls(self):
@@ -170,6 +1059,14 @@ class InvenioJSONSchemasState(object):
             return import_string(cls)
         return cls
 
+    @cached_property
+    def ref_expander_cls(self):
+        """Class replacing the ``$ref``, ``None`` to use ``JsonRef``."""
+        cls = self.app.config["JSONSCHEMAS_REF_EXPANDER_CLS"]
+        if isinstance(cls, str):
+            return import_string(cls)
+        return cls
+
     @cached_property
     def resolver_cls(self):
         """Loader to resolve the schema."""
@@ -178,28 +1075,165 @@ class InvenioJSONSchemasState(object):
             return import_string(cls)
         return cls
 
+    @cached_property
+    def precompress_encodings(self):
+        """Available content encodings of the serialized schemas."""
+        return [
+            encoding
+            for encoding in self.app.config["JSONSCHEMAS_PRECOMPRESS_ENCODINGS"]
+            if encoding in COMPRESSORS
+        ]
+
     def refresolver_store(self):
-        """Builds a local ref resolver store with aliased local references.
+        """Local ref resolver store with aliased local references.
 
         Abstracts configurations such as URI scheme and hostname under
         the configured non-standard URI scheme.
+
+        The store is built once, on first access, and then kept up to date
+        when new schemas are registered.
+
+        :returns: A read-only mapping of local URIs to schemas.
         """
-        store = {}
-        local_refresolver_uri_scheme = uri_scheme = self.app.config.get(
-            "JSONSCHEMAS_LOCAL_REFRESOLVER_URI_SCHEME"
-        )
-        for schema_uri, schema in self.schemas.items():
-            schema = self.get_schema(schema_uri)
-            schema_uri = "{uri_scheme}{schema_path}".format(
-                uri_scheme=local_refresolver_uri_scheme,
-                schema_path=schema_uri.lstrip("/"),
+        if self._refresolver_store is None:
+            start = time.perf_counter()
+            store = {}
+            for path in self.schemas:
+                uri, schema = self._refresolver_store_entry(path)
+                store[uri] = schema
+            refresolver_store_built.send(
+                self, duration=time.perf_counter() - start, size=len(store)
             )
-            if schema.get("$id"):
-                assert schema.get("$id") == schema_uri
+            self._refresolver_store = store
+            self._refresolver_store_view = MappingProxyType(store)
+        return self._refresolver_store_view
+
+    def _refresolver_store_entry(self, path):
+        """Build the local ref resolver store entry of a schema."""
+        schema = self.get_schema(path)
+        uri = self._local_uri(path)
+        if schema.get("$id"):
+            assert schema.get("$id") == uri
+        return uri, schema
+
+    def _local_uri(self, path):
+        """Build the URI of a schema in the local ref resolver store."""
+        return "{uri_scheme}{schema_path}".format(
+            uri_scheme=self.app.config.get("JSONSCHEMAS_LOCAL_REFRESOLVER_URI_SCHEME"),
+            schema_path=path.lstrip("/"),
+        )
+
+    def dependency_graph(self):
+        """Graph of the ``$ref`` between the registered schemas.
+
+        The references of the schemas are recorded as they are loaded. On first
+        access, the ones of the schemas which were not loaded yet are read from
+        their files, and the graph is then kept up to date when schemas are
+        registered. It is used to only evict from the caches the schemas
+        affected by a change.
+
+        :returns: A :class:`invenio_jsonschemas.graph.DependencyGraph`.
+        """
+        if not self._dependency_graph_complete:
+            for path in list(self.schemas):
+                if path not in self._dependency_graph:
+                    self._record_dependencies(path)
+            self._dependency_graph_complete = True
+        return self._dependency_graph
+
+    def _record_dependencies(self, path, schema=None):
+        """Record the schemas referenced by a schema in the dependency graph."""
+        self._dependency_graph.set_dependencies(
+            path, self._schema_dependencies(path, schema)
+        )
+
+    def _record_transitive_dependencies(self, path):
+        """Record the schemas referenced by a schema, directly or not."""
+        seen = set()
+        stack = [path]
+        while stack:
+            path = stack.pop()
+            if path in seen or path not in self.schemas:
+                continue
+            seen.add(path)
+            if path not in self._dependency_graph:
+                self._record_dependencies(path)
+            stack.extend(self._dependency_graph.dependencies(path))
+
+    def _schema_dependencies(self, path, schema=None):
+        """List the paths of the schemas referenced by a schema.
+
+        :param schema: the parsed schema. If ``None``, it is read from its
+            file, as the cached one may be outdated.
+        """
+        if schema is None:
+            try:
+                schema = self._parse_schema_file(os.path.join(self.schemas[path], path))
+            except (OSError, ValueError):
+                # the schema cannot be loaded, it will fail when it is used
+                return set()
+        base_uri = self.path_to_url(path)
+        dependencies = set()
+        for ref in iter_refs(schema):
+            dependency = self._ref_path(urldefrag(urljoin(base_uri, ref))[0])
+            if dependency is not None:
+                dependencies.add(dependency)
+        return dependencies
 
-            store[schema_uri] = schema
+    def _ref_path(self, uri):
+        """Get the schema path a URI refers to, whether it is registered or not."""
+        uri_scheme = self.app.config["JSONSCHEMAS_LOCAL_REFRESOLVER_URI_SCHEME"]
+        if uri.startswith(uri_scheme):
+            return uri[len(uri_scheme) :]
+        if uri in self.schemas:
+            return uri
+        path = self.url_to_path(uri)
+        if path is not None:
+            return path
+        parts = urlsplit(uri)
+        try:
+            endpoint, args = self.url_map.bind(parts.netloc).match(parts.path)
+        except HTTPException:
+            return None
+        return args.get("path") if endpoint == "schema" else None
+
+    def _invalidate(self, path):
+        """Evict a schema and the schemas referencing it from the caches.
+
+        The references of all the cached schemas which embed others are
+        recorded, so the graph does not need to be complete.
+        """
+        dependents = self._dependency_graph.dependents(path, transitive=True)
+
+        def changed(key):
+            # only the variants with replaced $ref embed the dependencies
+            return key[0] == path or (key[0] in dependents and key[1])
 
-        return store
+        self.schema_cache.evict(changed)
+        self.etag_cache.evict(changed)
+        self.response_cache.evict(changed)
+        for key in list(self._validators):
+            if key[0] == path or key[0] in dependents:
+                self._validators.pop(key, None)
+        for key in list(self._resources):
+            if key[0] == path:
+                self._resources.pop(key, None)
+
+    def _schema_registered(self, path):
+        """Update the state after a schema has been (re-)registered."""
+        self.__dict__.pop("shared_cache", None)
+        if self._url_index is not None:
+            self._url_index.update(dict.fromkeys(self._schema_urls(path), path))
+        self._url_memo.clear()
+        self._invalidate(path)
+        if self._dependency_graph_complete:
+            self._record_dependencies(path)
+        else:
+            # recorded again when the schema is loaded
+            self._dependency_graph.remove(path)
+        if self._refresolver_store is not None:
+            uri, schema = self._refresolver_store_entry(path)
+            self._refresolver_store[uri] = schema
 
 
 class InvenioJSONSchemas(object):
@@ -254,13 +1288,12 @@ class InvenioJSONSchemas(object):
         if entry_point_group:
             whitelisted_entries = app.config["JSONSCHEMAS_SCHEMAS"]
             # change to set to delete duplicate entries
-            for base_entry in entry_points(group=entry_point_group):
-                if (
-                    whitelisted_entries is None
-                    or base_entry.name in whitelisted_entries
-                ):
-                    directory = os.path.dirname(base_entry.load().__file__)
-                    state.register_schemas_dir(directory)
+            state.entry_points = [
+                base_entry
+                for base_entry in entry_points(group=entry_point_group)
+                if whitelisted_entries is None or base_entry.name in whitelisted_entries
+            ]
+            state.register_entry_points()
 
         # Init blueprints
         _register_blueprint = app.config.get(register_config_blueprint)
@@ -268,11 +1301,40 @@ class InvenioJSONSchemas(object):
             register_blueprint = _register_blueprint
 
         if register_blueprint:
+            if app.config["JSONSCHEMAS_ASYNC_VIEWS"]:
+                blueprint = create_async_blueprint(state)
+            else:
+                blueprint = create_blueprint(state)
             app.register_blueprint(
-                create_blueprint(state), url_prefix=app.config["JSONSCHEMAS_ENDPOINT"]
+                blueprint, url_prefix=app.config["JSONSCHEMAS_ENDPOINT"]
             )
 
+        # the loaders may retrieve the state through the application, e.g.
+        # the JSON resolver plugin, while warming
         self._state = app.extensions["invenio-jsonschemas"] = state
+
+        if app.config["JSONSCHEMAS_WARM_ON_INIT"]:
+            for path, error in state.warm():
+                app.logger.warning("Could not load schema {0}: {1}".format(path, error))
+
+        if app.config["JSONSCHEMAS_METRICS"]:
+            state.metrics = SchemaMetrics(state)
+            if app.config["JSONSCHEMAS_METRICS_URL"]:
+                app.add_url_rule(
+                    app.config["JSONSCHEMAS_METRICS_URL"],
+                    "invenio_jsonschemas_metrics",
+                    lambda: app.response_class(
+                        state.metrics.to_prometheus(),
+                        content_type=PROMETHEUS_CONTENT_TYPE,
+                    ),
+                )
+
+        if app.config["JSONSCHEMAS_WATCH"]:
+            state.watcher = SchemaWatcher(
+                state, interval=app.config["JSONSCHEMAS_WATCH_INTERVAL"]
+            )
+            state.watcher.start()
+
         return state
 
     def init_config(self, app):
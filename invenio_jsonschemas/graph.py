@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Graph of the references between schemas."""
+
+from __future__ import absolute_import, print_function
+
+import threading
+
+
+def iter_refs(schema):
+    """Iterate over the ``$ref`` of a schema.
+
+    :param schema: the schema.
+    :returns: iterator of the ``$ref`` values, in document order.
+    """
+    stack = [schema]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                yield ref
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+class DependencyGraph(object):
+    """Directed graph of the ``$ref`` between schemas.
+
+    Nodes are schema paths. A schema depends on the schemas it references,
+    which can be looked up with :meth:`dependencies`, and the schemas
+    referencing it can be looked up with :meth:`dependents`.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._forward = {}
+        self._reverse = {}
+        self._lock = threading.RLock()
+
+    def set_dependencies(self, path, dependencies):
+        """Set the schemas referenced by a schema, replacing the previous ones.
+
+        :param path: path of the schema.
+        :param dependencies: paths of the schemas it references.
+        """
+        dependencies = set(dependencies)
+        dependencies.discard(path)
+        with self._lock:
+            for dependency in self._forward.get(path, ()):
+                self._reverse[dependency].discard(path)
+            self._forward[path] = dependencies
+            self._reverse.setdefault(path, set())
+            for dependency in dependencies:
+                self._reverse.setdefault(dependency, set()).add(path)
+
+    def remove(self, path):
+        """Remove the references of a schema.
+
+        The schemas referencing it are kept, so that they are found again if
+        the schema is added back.
+
+        :param path: path of the schema.
+        """
+        with self._lock:
+            for dependency in self._forward.pop(path, ()):
+                self._reverse[dependency].discard(path)
+
+    def dependencies(self, path, transitive=False):
+        """Get the schemas referenced by a schema.
+
+        :param path: path of the schema.
+        :param transitive: also include the schemas referenced indirectly.
+        :returns: set of schema paths.
+        """
+        return self._walk(self._forward, path, transitive)
+
+    def dependents(self, path, transitive=False):
+        """Get the schemas referencing a schema.
+
+        :param path: path of the schema.
+        :param transitive: also include the schemas referencing it indirectly.
+        :returns: set of schema paths.
+        """
+        return self._walk(self._reverse, path, transitive)
+
+    def topological_order(self):
+        """Order the schemas so that each one comes after its dependencies.
+
+        The schemas of a reference cycle are ordered by path after the other
+        schemas they depend on.
+
+        :returns: list of schema paths.
+        """
+        with self._lock:
+            remaining = {
+                path: len(dependencies & self._forward.keys())
+                for path, dependencies in self._forward.items()
+            }
+            order = []
+            ready = sorted(path for path, count in remaining.items() if not count)
+            while remaining:
+                if not ready:
+                    # break a cycle
+                    ready = [min(remaining)]
+                path = ready.pop(0)
+                if remaining.pop(path, None) is None:
+                    continue
+                order.append(path)
+                for dependent in sorted(self._reverse.get(path, ())):
+                    if dependent in remaining:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0:
+                            ready.append(dependent)
+            return order
+
+    def __contains__(self, path):
+        """Check if the references of a schema are known."""
+        return path in self._forward
+
+    def _walk(self, edges, path, transitive):
+        """Get the nodes reachable from a node."""
+        with self._lock:
+            if not transitive:
+                return set(edges.get(path, ()))
+            seen = set()
+            stack = [path]
+            while stack:
+                for node in edges.get(stack.pop(), ()):
+                    if node not in seen and node != path:
+                        seen.add(node)
+                        stack.append(node)
+            return seen
@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Snapshot of the registered schemas, avoiding to scan directories at boot."""
+
+from __future__ import absolute_import, print_function
+
+import hashlib
+import json
+import os
+
+
+def entry_points_fingerprint(entries):
+    """Compute a fingerprint of the schemas entry points.
+
+    It changes whenever an entry point is added, removed or modified, or when
+    the distribution providing it is upgraded.
+
+    :param entries: the ``invenio_jsonschemas.schemas`` entry points.
+    :returns: The fingerprint.
+    """
+    items = []
+    for entry in entries:
+        dist = getattr(entry, "dist", None)
+        items.append(
+            [
+                entry.name,
+                entry.value,
+                dist.name if dist else None,
+                dist.version if dist else None,
+            ]
+        )
+    data = json.dumps(sorted(items)).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_index(filename, entries, schemas):
+    """Write the index of the registered schemas.
+
+    :param filename: path of the index file.
+    :param entries: the entry points the schemas were registered from.
+    :param schemas: mapping of the schema paths to their directory.
+    """
+    index = {"fingerprint": entry_points_fingerprint(entries), "schemas": schemas}
+    directory = os.path.dirname(os.path.abspath(filename))
+    os.makedirs(directory, exist_ok=True)
+    # write then rename, so that workers never read a partial index
+    tmp_filename = "{0}.{1}.tmp".format(filename, os.getpid())
+    with open(tmp_filename, "w") as file_:
+        json.dump(index, file_, separators=(",", ":"))
+    os.replace(tmp_filename, filename)
+
+
+def read_index(filename, entries):
+    """Read the index of the registered schemas.
+
+    :param filename: path of the index file.
+    :param entries: the entry points to register the schemas from.
+    :returns: The mapping of the schema paths to their directory, or ``None``
+        if the index does not exist or is outdated, e.g. if one of its
+        directories was removed.
+    """
+    try:
+        with open(filename) as file_:
+            index = json.load(file_)
+    except (OSError, ValueError):
+        return None
+    if index.get("fingerprint") != entry_points_fingerprint(entries):
+        return None
+    schemas = index["schemas"]
+    if not all(os.path.isdir(directory) for directory in set(schemas.values())):
+        return None
+    return schemas
@@ -0,0 +1,210 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Metrics of the schema caches, operations and requests."""
+
+from __future__ import absolute_import, print_function
+
+import bisect
+import threading
+from collections import defaultdict
+
+from .signals import (
+    refresolver_store_built,
+    refs_replaced,
+    schema_loaded,
+    schema_requested,
+    schema_resolved,
+    schema_serialized,
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""Content type of the Prometheus text format."""
+
+DURATION_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+"""Upper bounds in seconds of the buckets of the duration histograms."""
+
+
+class Histogram(object):
+    """Distribution of observed values in cumulative buckets."""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        """Constructor.
+
+        :param buckets: sorted upper bounds of the buckets.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Record a value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        """List the ``(upper bound, count)`` of the buckets, ``+Inf`` last."""
+        bounds = [repr(float(bound)) for bound in self.buckets] + ["+Inf"]
+        counts, total = [], 0
+        for count in self.counts:
+            total += count
+            counts.append(total)
+        return list(zip(bounds, counts))
+
+
+class SchemaMetrics(object):
+    """Collect metrics from the signals of a state.
+
+    It counts the requests per schema and variant, records the durations of
+    the operations (``load``, ``refs``, ``resolve``, ``serialize`` and
+    ``store``) per schema, and reads the statistics of the caches. See
+    :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_METRICS`.
+    """
+
+    def __init__(self, state):
+        """Constructor.
+
+        :param state: :class:`invenio_jsonschemas.ext.InvenioJSONSchemasState`
+            instance to collect the metrics of.
+        """
+        self.state = state
+        self.requests = defaultdict(int)
+        self.durations = defaultdict(Histogram)
+        self.serialized_bytes = {}
+        self._lock = threading.Lock()
+        # the signals keep weak references to the bound methods, so that the
+        # state and its application are not kept alive by the metrics
+        self._receivers = [
+            (schema_loaded, self._on_loaded),
+            (refs_replaced, self._on_refs_replaced),
+            (schema_resolved, self._on_resolved),
+            (schema_serialized, self._on_serialized),
+            (refresolver_store_built, self._on_store_built),
+            (schema_requested, self._on_requested),
+        ]
+        for signal, receiver in self._receivers:
+            signal.connect(receiver, sender=state)
+
+    def disconnect(self):
+        """Stop collecting metrics."""
+        for signal, receiver in self._receivers:
+            signal.disconnect(receiver, sender=self.state)
+
+    def to_prometheus(self):
+        """Export the metrics in the Prometheus text format.
+
+        :returns: The metrics, see :data:`PROMETHEUS_CONTENT_TYPE`.
+        """
+        lines = []
+
+        def metric(name, kind, help_):
+            lines.append("# HELP invenio_jsonschemas_{0} {1}".format(name, help_))
+            lines.append("# TYPE invenio_jsonschemas_{0} {1}".format(name, kind))
+
+        def sample(name, labels, value):
+            lines.append(
+                "invenio_jsonschemas_{0}{1} {2}".format(name, _labels(labels), value)
+            )
+
+        caches = {
+            "schema": self.state.schema_cache,
+            "etag": self.state.etag_cache,
+            "response": self.state.response_cache,
+        }
+        infos = {name: cache.info() for name, cache in caches.items()}
+        for field, kind, help_ in (
+            ("hits", "counter", "Number of cache hits."),
+            ("misses", "counter", "Number of cache misses."),
+            ("evictions", "counter", "Number of entries evicted from the cache."),
+            ("size", "gauge", "Number of entries in the cache."),
+        ):
+            name = "cache_{0}{1}".format(field, "_total" if kind == "counter" else "")
+            metric(name, kind, help_)
+            for cache, info in sorted(infos.items()):
+                sample(name, {"cache": cache}, getattr(info, field))
+
+        with self._lock:
+            requests = sorted(self.requests.items())
+            durations = [
+                (key, histogram.cumulative_counts(), histogram.sum, histogram.count)
+                for key, histogram in sorted(
+                    self.durations.items(),
+                    key=lambda item: (item[0][0], item[0][1] or ""),
+                )
+            ]
+            serialized_bytes = sorted(self.serialized_bytes.items())
+
+        metric("requests_total", "counter", "Number of schema requests.")
+        for (path, variant, status), count in requests:
+            labels = {"path": path, "variant": variant, "status": status}
+            sample("requests_total", labels, count)
+
+        name = "operation_duration_seconds"
+        metric(name, "histogram", "Duration of the schema operations.")
+        for (operation, path), buckets, sum_, count in durations:
+            labels = {"operation": operation}
+            if path is not None:
+                labels["path"] = path
+            for bound, bucket_count in buckets:
+                sample(name + "_bucket", dict(labels, le=bound), bucket_count)
+            sample(name + "_sum", labels, repr(sum_))
+            sample(name + "_count", labels, count)
+
+        metric("serialized_bytes", "gauge", "Size of the last serialized schema.")
+        for path, size in serialized_bytes:
+            sample("serialized_bytes", {"path": path}, size)
+        return "\n".join(lines) + "\n"
+
+    def _observe(self, operation, path, duration):
+        """Record the duration of an operation."""
+        with self._lock:
+            self.durations[(operation, path)].observe(duration)
+
+    def _on_loaded(self, sender, path, duration, **kwargs):
+        """Record the parsing of a schema file."""
+        self._observe("load", path, duration)
+
+    def _on_refs_replaced(self, sender, path, duration, **kwargs):
+        """Record the replacement of the ``$ref`` of a schema."""
+        self._observe("refs", path, duration)
+
+    def _on_resolved(self, sender, path, duration, **kwargs):
+        """Record the resolution of a schema."""
+        self._observe("resolve", path, duration)
+
+    def _on_store_built(self, sender, duration, **kwargs):
+        """Record the building of the ref resolver store."""
+        self._observe("store", None, duration)
+
+    def _on_serialized(self, sender, path, duration, size, **kwargs):
+        """Record a serialization."""
+        self._observe("serialize", path, duration)
+        if path is not None:
+            with self._lock:
+                self.serialized_bytes[path] = size
+
+    def _on_requested(self, sender, path, with_refs, resolved, status, **kwargs):
+        """Count a request."""
+        variant = "resolved" if resolved else "refs" if with_refs else "raw"
+        with self._lock:
+            self.requests[(path, variant, str(status))] += 1
+
+
+def _labels(labels):
+    """Format the labels of a sample."""
+    if not labels:
+        return ""
+    return "{{{0}}}".format(
+        ",".join(
+            '{0}="{1}"'.format(
+                key,
+                str(value)
+                .replace("\\", "\\\\")
+                .replace("\n", "\\n")
+                .replace('"', '\\"'),
+            )
+            for key, value in labels.items()
+        )
+    )
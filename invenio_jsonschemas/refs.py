@@ -0,0 +1,186 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Expansion of ``$ref`` in JSON Schemas."""
+
+from __future__ import absolute_import, print_function
+
+import re
+from urllib.parse import unquote, urldefrag, urljoin
+
+from jsonref import jsonloader
+
+
+class RefExpander(object):
+    """Replace the ``$ref`` of a schema by the schemas they refer to.
+
+    It can be used as
+    :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_REF_EXPANDER_CLS`
+    instead of ``jsonref.JsonRef.replace_refs``. Like the latter, an
+    object containing a ``$ref`` is replaced by the referred schema, and the
+    other keywords of the object are ignored. But:
+
+    - references to registered schemas are loaded directly from the
+      registered files, other ones with the loader,
+    - each referred schema is expanded once,
+    - recursive references, references to a schema referred to more than
+      once, and the references nested deeper than ``max_inline_depth``, are
+      not expanded. They are replaced by a reference to a copy of the
+      referred schema in the ``$defs`` of the root schema, or to the
+      referred part of the root schema itself,
+    - the ``$id`` of the embedded schemas are removed, so that the internal
+      references resolve against the root schema.
+
+    The expansion thus always terminates, and its size is linear in the size
+    of the referred schemas.
+    """
+
+    def __init__(self, state, max_inline_depth=None):
+        """Constructor.
+
+        :param state: :class:`invenio_jsonschemas.ext.InvenioJSONSchemasState`
+            instance used to retrieve the registered schemas.
+        :param max_inline_depth: maximum number of nested references which
+            are expanded. (Default: ``None``, unlimited)
+        """
+        self.state = state
+        self.max_inline_depth = max_inline_depth
+
+    def expand(self, schema, base_uri=""):
+        """Expand the ``$ref`` of a schema.
+
+        :param schema: the schema, which is not modified.
+        :param base_uri: URI of the schema, relative references are resolved
+            against it.
+        :returns: the expanded schema.
+        """
+        self._canonical_uris = {}
+        self._root_uri = self._canonical_uri(urldefrag(base_uri)[0])
+        self._documents = {self._root_uri: schema}
+        self._repeated = set()
+        result = self._expand_root(schema)
+        # expand again, referring to the schemas inlined several times
+        repeated = {target for target, count in self._inlined.items() if count > 1}
+        if repeated:
+            self._repeated = repeated
+            result = self._expand_root(schema)
+        return result
+
+    def _expand_root(self, schema):
+        """Expand the root schema."""
+        self._inlined = {}
+        self._expanded = {}
+        self._in_progress = set()
+        self._defs = {}
+        self._def_names = {}
+
+        self._in_progress.add((self._root_uri, ""))
+        result = self._expand(schema, self._root_uri, 0)
+        # expand the hoisted schemas, which can hoist other ones
+        done = set()
+        while set(self._def_names) - done:
+            for target in sorted(set(self._def_names) - done):
+                done.add(target)
+                if target not in self._expanded:
+                    self._expand_target(target, 0)
+                self._defs[self._def_names[target]] = self._expanded[target]
+
+        if self._defs and isinstance(result, dict):
+            result = dict(result)
+            result["$defs"] = dict(result.get("$defs", {}), **self._defs)
+        return result
+
+    def _expand(self, node, document_uri, depth):
+        """Expand a node of a document."""
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                return self._expand_ref(urljoin(document_uri, ref), depth)
+            embedded = document_uri != self._root_uri
+            return {
+                key: self._expand(value, document_uri, depth)
+                for key, value in node.items()
+                if not (embedded and key == "$id" and isinstance(value, str))
+            }
+        if isinstance(node, list):
+            return [self._expand(value, document_uri, depth) for value in node]
+        return node
+
+    def _expand_ref(self, uri, depth):
+        """Expand a reference, or replace it by an internal reference."""
+        document_uri, fragment = urldefrag(uri)
+        document_uri = self._canonical_uri(document_uri)
+        target = (document_uri, unquote(fragment))
+        recursive = target in self._in_progress
+        too_deep = self.max_inline_depth is not None and depth >= self.max_inline_depth
+        if recursive or too_deep or target in self._repeated:
+            if document_uri == self._root_uri:
+                # the root schema is fully expanded, refer to it directly
+                return {"$ref": "#" + fragment}
+            return {"$ref": "#/$defs/" + self._def_name(target)}
+        self._inlined[target] = self._inlined.get(target, 0) + 1
+        if target not in self._expanded:
+            self._expand_target(target, depth + 1)
+        return self._expanded[target]
+
+    def _expand_target(self, target, depth):
+        """Expand the schema a reference refers to."""
+        document_uri, pointer = target
+        self._in_progress.add(target)
+        try:
+            node = _resolve_pointer(self._document(document_uri), pointer)
+            self._expanded[target] = self._expand(node, document_uri, depth)
+        finally:
+            self._in_progress.discard(target)
+
+    def _document(self, uri):
+        """Load a referred document."""
+        if uri not in self._documents:
+            path = self._path(uri)
+            if path is not None:
+                document = self.state.get_schema(path)
+            elif self.state.loader_cls:
+                document = self.state.loader_cls()(uri)
+            else:
+                document = jsonloader(uri)
+            self._documents[uri] = document
+        return self._documents[uri]
+
+    def _def_name(self, target):
+        """Get the name of a hoisted schema in the ``$defs``."""
+        if target not in self._def_names:
+            document_uri, pointer = target
+            path = self._path(document_uri) or document_uri
+            name = re.sub(r"[^\w.-]", "_", path + pointer)
+            names = set(self._def_names.values())
+            unique_name, index = name, 1
+            while unique_name in names:
+                index += 1
+                unique_name = "{0}_{1}".format(name, index)
+            self._def_names[target] = unique_name
+        return self._def_names[target]
+
+    def _canonical_uri(self, uri):
+        """Get the same URI for all the references to a registered schema."""
+        if uri not in self._canonical_uris:
+            path = self._path(uri)
+            self._canonical_uris[uri] = self.state.path_to_url(path) if path else uri
+        return self._canonical_uris[uri]
+
+    def _path(self, uri):
+        """Get the path of a registered schema from its URI."""
+        uri_scheme = self.state.app.config["JSONSCHEMAS_LOCAL_REFRESOLVER_URI_SCHEME"]
+        if uri.startswith(uri_scheme):
+            uri = uri[len(uri_scheme) :]
+        if uri in self.state.schemas:
+            return uri
+        return self.state.url_to_path(uri)
+
+
+def _resolve_pointer(document, pointer):
+    """Resolve a JSON pointer in a document."""
+    node = document
+    for part in pointer.split("/")[1:]:
+        part = part.replace("~1", "/").replace("~0", "~")
+        node = node[int(part)] if isinstance(node, list) else node[part]
+    return node
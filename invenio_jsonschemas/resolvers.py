@@ -0,0 +1,212 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Alternative schema resolvers.
+
+They can be used as :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_RESOLVER_CLS`
+instead of the default :func:`invenio_jsonschemas.utils.resolve_schema`.
+"""
+
+from __future__ import absolute_import, print_function
+
+from jsonref import JsonRef
+
+
+def resolve_all_of(schema):
+    """Transform JSON schemas "allOf", like the default resolver.
+
+    It gives exactly the same result as
+    :func:`invenio_jsonschemas.utils.resolve_schema`, but is suited to large
+    schemas: it does not copy the parts of the schema which are not modified,
+    resolves the sub-schemas referenced several times (e.g. through the same
+    ``$ref``) only once and does not recurse, whatever the depth of the schema.
+
+    The given schema is not modified, the resolved schema may share parts of
+    it.
+
+    :param dict schema: the schema to resolve.
+    :returns: the resolved schema
+    """
+    result = {}
+    memo = {}
+    # each task resolves a sub-schema and stores it in a container
+    stack = [(schema, result, None)]
+    while stack:
+        node, container, key = stack.pop()
+        if isinstance(node, JsonRef):
+            node = node.__subject__
+        if not isinstance(node, dict):
+            container[key] = node
+            continue
+        if id(node) in memo:
+            container[key] = memo[id(node)][1]
+            continue
+
+        original = node
+        while "allOf" in node:
+            node = _merge_all_of(node)
+        if "properties" in node:
+            resolved = dict(node)
+            properties = resolved["properties"] = dict.fromkeys(node["properties"])
+            for name, sub_schema in node["properties"].items():
+                stack.append((sub_schema, properties, name))
+        elif "items" in node:
+            resolved = dict(node)
+            stack.append((node["items"], resolved, "items"))
+        else:
+            resolved = node
+        # keep a reference to the original node, so that its id is not reused
+        memo[id(original)] = (original, resolved)
+        container[key] = resolved
+    return result[None]
+
+
+def visit_schema(value, container, key, schedule):
+    """Visit a keyword whose value is a schema (e.g. ``not``)."""
+    schedule(value, container, key)
+
+
+def visit_array(value, container, key, schedule):
+    """Visit a keyword whose value is a schema or an array of schemas."""
+    if isinstance(value, list):
+        items = container[key] = [None] * len(value)
+        for index, sub_schema in enumerate(value):
+            schedule(sub_schema, items, index)
+    else:
+        schedule(value, container, key)
+
+
+def visit_mapping(value, container, key, schedule):
+    """Visit a keyword whose value maps names to schemas (e.g. ``properties``)."""
+    if isinstance(value, dict):
+        mapping = container[key] = dict.fromkeys(value)
+        for name, sub_schema in value.items():
+            schedule(sub_schema, mapping, name)
+    else:
+        container[key] = value
+
+
+SUBSCHEMA_KEYWORDS = {
+    "$defs": visit_mapping,
+    "additionalItems": visit_schema,
+    "additionalProperties": visit_schema,
+    "anyOf": visit_array,
+    "contains": visit_schema,
+    "definitions": visit_mapping,
+    "dependencies": visit_mapping,
+    "dependentSchemas": visit_mapping,
+    "else": visit_schema,
+    "if": visit_schema,
+    "items": visit_array,
+    "not": visit_schema,
+    "oneOf": visit_array,
+    "patternProperties": visit_mapping,
+    "prefixItems": visit_array,
+    "properties": visit_mapping,
+    "propertyNames": visit_schema,
+    "then": visit_schema,
+    "unevaluatedItems": visit_schema,
+    "unevaluatedProperties": visit_schema,
+}
+"""Keywords containing sub-schemas, with the function visiting them."""
+
+
+class SchemaResolver(object):
+    """Resolver transforming "allOf" in all the sub-schemas of a schema.
+
+    Unlike the default resolver, which only looks into ``properties`` and
+    ``items``, it resolves the sub-schemas of all the keywords registered in
+    :attr:`keywords`, e.g. ``additionalProperties``, ``definitions``,
+    ``patternProperties``, ``oneOf`` or ``anyOf``. "allOf" sub-schemas are
+    merged the same way as the default resolver does. Each sub-schema is
+    visited once, without recursion.
+
+    The resolver is called with the schema to resolve, which is not modified.
+    Custom keywords can be registered with :meth:`register`.
+    """
+
+    def __init__(self, keywords=None):
+        """Constructor.
+
+        :param keywords: mapping of the keywords containing sub-schemas to
+            their visitor. (Default: :data:`SUBSCHEMA_KEYWORDS`)
+        """
+        #: Mapping of the keywords containing sub-schemas to their visitor.
+        self.keywords = dict(SUBSCHEMA_KEYWORDS if keywords is None else keywords)
+
+    def register(self, keyword, visitor=visit_schema):
+        """Register a keyword containing sub-schemas.
+
+        :param keyword: the keyword.
+        :param visitor: function called with the value of the keyword, the
+            resolved schema and the keyword, and a function scheduling the
+            resolution of a sub-schema into a container at a key. See
+            :func:`visit_schema`, :func:`visit_array` and
+            :func:`visit_mapping`.
+        """
+        self.keywords[keyword] = visitor
+
+    def __call__(self, schema):
+        """Resolve a schema.
+
+        :param dict schema: the schema to resolve.
+        :returns: the resolved schema
+        """
+        result = {}
+        memo = {}
+        stack = [(schema, result, None)]
+
+        def schedule(node, container, key):
+            stack.append((node, container, key))
+
+        while stack:
+            node, container, key = stack.pop()
+            if isinstance(node, JsonRef):
+                node = node.__subject__
+            if not isinstance(node, dict):
+                container[key] = node
+                continue
+            if id(node) in memo:
+                container[key] = memo[id(node)][1]
+                continue
+
+            original = node
+            while "allOf" in node:
+                node = _merge_all_of(node)
+            keywords = [keyword for keyword in node if keyword in self.keywords]
+            resolved = dict(node) if keywords else node
+            for keyword in keywords:
+                self.keywords[keyword](node[keyword], resolved, keyword, schedule)
+            memo[id(original)] = (original, resolved)
+            container[key] = resolved
+        return result[None]
+
+
+resolve_all_keywords = SchemaResolver()
+"""Resolver of all the sub-schemas, see :class:`SchemaResolver`."""
+
+
+def _merge_all_of(schema):
+    """Merge the "allOf" sub-schemas of a schema into it.
+
+    Only the dictionaries modified by the merge are copied, each one once.
+    """
+    merged = dict(schema)
+    owned = {id(merged)}
+    for sub_schema in merged.pop("allOf"):
+        sub_schema = dict(sub_schema)
+        sub_schema.pop("title", None)
+        stack = [(merged, sub_schema)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if isinstance(value, dict) and value:
+                    child = target.get(key, {})
+                    if id(child) not in owned:
+                        child = dict(child)
+                        owned.add(id(child))
+                    target[key] = child
+                    stack.append((child, value))
+                else:
+                    target[key] = value
+    return merged
@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Signals sent by Invenio-JSONSchemas.
+
+All the signals are sent by the
+:class:`invenio_jsonschemas.ext.InvenioJSONSchemasState` instance. Durations
+are in seconds.
+"""
+
+from __future__ import absolute_import, print_function
+
+from blinker import Namespace
+
+_signals = Namespace()
+
+schema_loaded = _signals.signal("jsonschemas-schema-loaded")
+"""Signal sent after a schema file is parsed.
+
+Parameters: ``path`` and ``duration``.
+"""
+
+refs_replaced = _signals.signal("jsonschemas-refs-replaced")
+"""Signal sent after the ``$ref`` of a schema are replaced.
+
+Parameters: ``path`` and ``duration``. ``JsonRef`` replaces the references
+lazily: when the schema is also resolved, the replacement is included in the
+duration of :data:`schema_resolved` instead.
+"""
+
+schema_resolved = _signals.signal("jsonschemas-schema-resolved")
+"""Signal sent after a schema is resolved.
+
+Parameters: ``path`` and ``duration``.
+"""
+
+schema_serialized = _signals.signal("jsonschemas-schema-serialized")
+"""Signal sent after a schema is serialized.
+
+Parameters: ``path``, ``duration`` and ``size``, the number of bytes of the
+uncompressed JSON document.
+"""
+
+refresolver_store_built = _signals.signal("jsonschemas-refresolver-store-built")
+"""Signal sent after the local ref resolver store is built.
+
+Parameters: ``duration`` and ``size``, the number of schemas in the store.
+"""
+
+schema_requested = _signals.signal("jsonschemas-schema-requested")
+"""Signal sent when a schema is served by the endpoint.
+
+Parameters: ``path``, ``with_refs``, ``resolved`` and ``status``, the status
+code of the response.
+"""
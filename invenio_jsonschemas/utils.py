@@ -5,7 +5,115 @@
 
 from __future__ import absolute_import, print_function
 
+import importlib.util
+import os
+from collections.abc import Mapping
 from copy import deepcopy
+from importlib.machinery import PathFinder
+
+from jsonref import JsonRef
+
+
+class FrozenDict(dict):
+    """Read-only dictionary.
+
+    Use :func:`copy.deepcopy` or :func:`thaw` to get a mutable copy.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        """Raise a ``TypeError``, as the object is read-only."""
+        raise TypeError("{0} is read-only".format(type(self).__name__))
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        """Shallow mutable copy."""
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        """Deep mutable copy."""
+        return thaw(self, memo)
+
+    def __reduce__(self):
+        """Support pickling."""
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list.
+
+    Use :func:`copy.deepcopy` or :func:`thaw` to get a mutable copy.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        """Raise a ``TypeError``, as the object is read-only."""
+        raise TypeError("{0} is read-only".format(type(self).__name__))
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = clear = extend = insert = pop = remove = reverse = sort = _readonly
+
+    def __copy__(self):
+        """Shallow mutable copy."""
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        """Deep mutable copy."""
+        return thaw(self, memo)
+
+    def __reduce__(self):
+        """Support pickling."""
+        return (FrozenList, (list(self),))
+
+
+def freeze(obj, memo=None):
+    """Get a read-only version of a JSON document.
+
+    ``$ref`` replaced by ``jsonref.JsonRef`` proxies are dereferenced.
+    Objects shared between several places of the document, including
+    recursive ones, stay shared in the read-only version.
+
+    :param obj: the JSON document.
+    :returns: the document made of :class:`FrozenDict` and
+        :class:`FrozenList`.
+    """
+    if isinstance(obj, (FrozenDict, FrozenList)):
+        return obj
+    if isinstance(obj, JsonRef):
+        obj = obj.__subject__
+    if not isinstance(obj, (Mapping, list)):
+        return obj
+    memo = {} if memo is None else memo
+    if id(obj) not in memo:
+        # register the container before its items to support cycles
+        if isinstance(obj, Mapping):
+            frozen = memo[id(obj)] = FrozenDict()
+            dict.update(frozen, ((k, freeze(v, memo)) for k, v in obj.items()))
+        else:
+            frozen = memo[id(obj)] = FrozenList()
+            list.extend(frozen, (freeze(v, memo) for v in obj))
+    return memo[id(obj)]
+
+
+def thaw(obj, memo=None):
+    """Get a mutable deep copy of a JSON document.
+
+    :param obj: the JSON document, usually returned by :func:`freeze`.
+    :returns: the document made of ``dict`` and ``list``.
+    """
+    if isinstance(obj, JsonRef):
+        obj = obj.__subject__
+    if not isinstance(obj, (Mapping, list)):
+        return obj
+    memo = {} if memo is None else memo
+    if id(obj) not in memo:
+        if isinstance(obj, Mapping):
+            copy = memo[id(obj)] = {}
+            copy.update((k, thaw(v, memo)) for k, v in obj.items())
+        else:
+            copy = memo[id(obj)] = []
+            copy.extend(thaw(v, memo) for v in obj)
+    return memo[id(obj)]
 
 
 def resolve_schema(schema):
@@ -23,6 +131,8 @@ def resolve_schema(schema):
     types (object, string, number, ...). Optional structures like "schema
     dependencies" or "oneOf" keywords are not supported.
 
+    The given schema is not modified.
+
     :param dict schema: the schema to resolve.
     :returns: the resolved schema
 
@@ -35,21 +145,62 @@ def resolve_schema(schema):
     def traverse(schema):
         if isinstance(schema, dict):
             if "allOf" in schema:
+                schema = dict(schema)
                 for x in schema.pop("allOf"):
-                    sub_schema = x
+                    sub_schema = dict(x)
                     sub_schema.pop("title", None)
                     schema = _merge_dicts(schema, sub_schema)
                 schema = traverse(schema)
             elif "properties" in schema:
-                for x in schema.get("properties", []):
-                    schema["properties"][x] = traverse(schema["properties"][x])
+                schema = dict(schema)
+                schema["properties"] = {
+                    k: traverse(v) for k, v in schema["properties"].items()
+                }
             elif "items" in schema:
+                schema = dict(schema)
                 schema["items"] = traverse(schema["items"])
         return schema
 
     return traverse(schema)
 
 
+def entry_point_directory(entry):
+    """Find the directory of the package of an entry point.
+
+    The package is located from its import spec, without executing it nor its
+    parent packages. Packages which cannot be located this way, for example
+    namespace packages spanning several directories, are imported.
+
+    :param entry: entry point whose value is a package name, e.g.
+        ``my_module.jsonschemas``.
+    :returns: The directory path.
+    """
+    name = entry.value.partition(":")[0].strip()
+    spec = _find_spec(name)
+    if spec is not None:
+        if spec.origin and os.path.isfile(spec.origin):
+            return os.path.dirname(spec.origin)
+        locations = list(spec.submodule_search_locations or [])
+        if len(locations) == 1:
+            return locations[0]
+    return os.path.dirname(entry.load().__file__)
+
+
+def _find_spec(name):
+    """Find the spec of a module without importing its parent packages."""
+    parent, _, _ = name.partition(".")
+    try:
+        spec = importlib.util.find_spec(parent)
+    except (ImportError, ValueError):
+        return None
+    for part in name.split(".")[1:]:
+        if spec is None or spec.submodule_search_locations is None:
+            return None
+        parent = "{0}.{1}".format(parent, part)
+        spec = PathFinder.find_spec(parent, spec.submodule_search_locations)
+    return spec
+
+
 def _merge_dicts(first, second):
     """Merge the 'second' multiple-dictionary into the 'first' one."""
     new = deepcopy(first)
@@ -0,0 +1,195 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Bulk validation of records against registered JSON Schemas."""
+
+from __future__ import absolute_import, print_function
+
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from urllib.parse import urljoin
+
+from jsonschema.exceptions import ValidationError
+from jsonschema.validators import validator_for
+from referencing import Registry
+from referencing.jsonschema import specification_with
+
+from .errors import JSONSchemaNotFound
+
+ValidationResult = namedtuple(
+    "ValidationResult",
+    ["schema_url", "path", "record", "errors", "error"],
+    defaults=[None],
+)
+"""Result of the validation of one record.
+
+``errors`` is the list of ``jsonschema.exceptions.ValidationError``
+raised by the record, empty if the record is valid. ``error`` is the
+:class:`invenio_jsonschemas.errors.JSONSchemaNotFound` raised if the schema URL
+does not match any registered schema, in which case ``path`` is ``None`` and
+the record is not validated.
+"""
+
+
+def iter_validate(state, items, draft=None, processes=None, chunk_size=500):
+    """Validate many records, lazily yielding one result per record.
+
+    Records are grouped by the schema path their URL resolves to, and one
+    validator per schema is reused for the whole group. Results are yielded in
+    the same order as the input.
+
+    :param state: :class:`invenio_jsonschemas.ext.InvenioJSONSchemasState`
+        instance used to retrieve the schemas.
+    :param items: iterable of ``(schema_url, record)`` pairs.
+    :param draft: jsonschema validator class to use, see
+        :meth:`invenio_jsonschemas.ext.InvenioJSONSchemasState.get_validator`.
+    :param processes: number of worker processes to validate with. If
+        ``None``, records are validated in the current process.
+    :param chunk_size: number of records sent at once to a worker process.
+    :returns: iterator of :class:`ValidationResult`.
+    """
+    items = _resolve_paths(state, items)
+    if not processes:
+        for schema_url, path, record, error in items:
+            if error is not None:
+                yield ValidationResult(schema_url, path, record, [], error)
+                continue
+            validator = state.get_validator(path, draft=draft)
+            errors = list(validator.iter_errors(record))
+            yield ValidationResult(schema_url, path, record, errors)
+        return
+
+    resources = _registry_resources(state)
+    urls = {path: state.path_to_url(path) for path in state.list_schemas()}
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(resources, urls, draft),
+    ) as executor:
+        # keep a bounded number of chunks in flight so that memory usage does
+        # not depend on the size of the input
+        pending = deque()
+        chunks = iter(lambda: list(islice(items, chunk_size)), [])
+        for chunk in chunks:
+            pending.append(
+                (
+                    chunk,
+                    executor.submit(
+                        _validate_chunk,
+                        [
+                            (path, record)
+                            for _, path, record, error in chunk
+                            if error is None
+                        ],
+                    ),
+                )
+            )
+            if len(pending) >= processes * 2:
+                yield from _chunk_results(*pending.popleft())
+        while pending:
+            yield from _chunk_results(*pending.popleft())
+
+
+def validator_specification(cls):
+    """Get the referencing specification matching a validator class."""
+    return specification_with(cls.META_SCHEMA.get("$id") or cls.META_SCHEMA["id"])
+
+
+def with_base_uri(schema, cls, uri):
+    """Identify a schema by an URI, unless it already has an identifier.
+
+    Its relative references are then resolved against this URI.
+
+    :param schema: the schema.
+    :param cls: jsonschema validator class the schema is validated with.
+    :param uri: URI of the schema.
+    :returns: The schema, or a shallow copy of it with an identifier.
+    """
+    specification = validator_specification(cls)
+    if specification.id_of(schema):
+        return schema
+    schema = dict(schema)
+    schema.setdefault("$id" if "$id" in cls.META_SCHEMA else "id", uri)
+    if not specification.id_of(schema):
+        # drafts up to 7 ignore the keywords next to a ``$ref``, which is then
+        # the only one to resolve
+        schema["$ref"] = urljoin(uri, schema["$ref"])
+    return schema
+
+
+def _resolve_paths(state, items):
+    """Resolve the schema path of each item, or the error of its lookup."""
+    paths = {}
+    for schema_url, record in items:
+        if schema_url not in paths:
+            paths[schema_url] = state.url_to_path(schema_url)
+        path = paths[schema_url]
+        error = JSONSchemaNotFound(schema_url) if path is None else None
+        yield schema_url, path, record, error
+
+
+def _registry_resources(state):
+    """Map every URI a registered schema can be referenced with to it."""
+    store = state.refresolver_store()
+    uri_scheme = state.app.config.get("JSONSCHEMAS_LOCAL_REFRESOLVER_URI_SCHEME")
+    resources = {}
+    for path in state.list_schemas():
+        schema = store[uri_scheme + path.lstrip("/")]
+        resources[uri_scheme + path.lstrip("/")] = schema
+        resources[path] = schema
+        resources[state.path_to_url(path)] = schema
+    return resources
+
+
+def _chunk_results(chunk, future):
+    """Yield the results of a chunk validated by a worker."""
+    results = iter(future.result())
+    for schema_url, path, record, error in chunk:
+        if error is not None:
+            yield ValidationResult(schema_url, path, record, [], error)
+        else:
+            yield ValidationResult(schema_url, path, record, next(results))
+
+
+_worker = {}
+"""Schemas and validators of a worker process."""
+
+
+def _init_worker(resources, urls, draft):
+    """Initialize a worker process."""
+    _worker.update(resources=resources, urls=urls, draft=draft, validators={})
+
+
+def _validate_chunk(chunk):
+    """Validate a chunk of ``(path, record)`` pairs in a worker process."""
+    resources, validators = _worker["resources"], _worker["validators"]
+    results = []
+    for path, record in chunk:
+        if path not in validators:
+            schema = resources[path]
+            cls = _worker["draft"] or validator_for(schema)
+            registry = Registry().with_contents(
+                resources.items(),
+                default_specification=validator_specification(cls),
+            )
+            schema = with_base_uri(schema, cls, _worker["urls"][path])
+            validators[path] = cls(schema, registry=registry)
+        results.append(
+            [_portable_error(e) for e in validators[path].iter_errors(record)]
+        )
+    return results
+
+
+def _portable_error(error):
+    """Copy a validation error so that it can be sent between processes."""
+    return ValidationError(
+        error.message,
+        validator=error.validator,
+        path=error.relative_path,
+        context=[_portable_error(e) for e in error.context],
+        validator_value=error.validator_value,
+        instance=error.instance,
+        schema=error.schema,
+        schema_path=error.relative_schema_path,
+    )
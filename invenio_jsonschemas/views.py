@@ -8,11 +8,12 @@ from __future__ import absolute_import, print_function
 
 import json
 import os
+import re
 
-from flask import Blueprint, abort, current_app, jsonify, request, send_from_directory
-from jsonref import JsonRef
+from flask import Blueprint, abort, current_app, request, send_from_directory
 
 from .errors import JSONSchemaNotFound
+from .signals import schema_requested
 
 
 def create_blueprint(state):
@@ -29,30 +30,177 @@ def create_blueprint(state):
     @blueprint.route("/<path:schema_path>")
     def get_schema(schema_path):
         """Retrieve a schema."""
-        try:
-            schema_dir = state.get_schema_dir(schema_path)
-        except JSONSchemaNotFound:
-            abort(404)
-
-        resolved = request.args.get(
-            "resolved", current_app.config.get("JSONSCHEMAS_RESOLVE_SCHEMA"), type=int
+        schema_dir, with_refs, resolved, encoding = _parse_request(state, schema_path)
+        etag = state.get_schema_etag(
+            schema_path, with_refs=with_refs, resolved=resolved
         )
-
-        with_refs = (
-            request.args.get(
-                "refs", current_app.config.get("JSONSCHEMAS_REPLACE_REFS"), type=int
+        serialized = schema = None
+        if (resolved or with_refs) and not _not_modified(etag, encoding):
+            serialized = state.get_serialized_schema(
+                schema_path, with_refs=with_refs, resolved=resolved, streamed=True
             )
-            or resolved
+            if serialized.data is None or encoding not in serialized.encodings:
+                # streamed responses are not compressed, nor the schemas of a
+                # shared cache written without this encoding
+                encoding = None
+                if serialized.data is None and not _not_modified(etag, encoding):
+                    schema = state.get_schema(
+                        schema_path, with_refs=with_refs, resolved=resolved
+                    )
+        return _schema_response(
+            state,
+            schema_path,
+            schema_dir,
+            with_refs,
+            resolved,
+            etag,
+            encoding,
+            serialized,
+            schema,
         )
 
-        if resolved or with_refs:
-            schema = state.get_schema(
-                schema_path, with_refs=with_refs, resolved=resolved
-            )
-            return jsonify(
-                schema.__subject__ if isinstance(schema, JsonRef) else schema
+    return blueprint
+
+
+def create_async_blueprint(state):
+    """Create blueprint serving JSON schemas with an asynchronous view.
+
+    The schemas are loaded without blocking the event loop, see
+    :meth:`invenio_jsonschemas.ext.InvenioJSONSchemasState.get_schema_async`.
+    Flask needs to be installed with the ``async`` extra.
+
+    :param state: :class:`invenio_jsonschemas.ext.InvenioJSONSchemasState`
+        instance used to retrieve the schemas.
+    """
+    blueprint = Blueprint(
+        "invenio_jsonschemas",
+        __name__,
+    )
+
+    @blueprint.route("/<path:schema_path>")
+    async def get_schema(schema_path):
+        """Retrieve a schema."""
+        schema_dir, with_refs, resolved, encoding = _parse_request(state, schema_path)
+        etag = await state.get_schema_etag_async(
+            schema_path, with_refs=with_refs, resolved=resolved
+        )
+        serialized = schema = None
+        if (resolved or with_refs) and not _not_modified(etag, encoding):
+            serialized = await state.get_serialized_schema_async(
+                schema_path, with_refs=with_refs, resolved=resolved, streamed=True
             )
-        else:
-            return send_from_directory(schema_dir, schema_path)
+            if serialized.data is None or encoding not in serialized.encodings:
+                # streamed responses are not compressed, nor the schemas of a
+                # shared cache written without this encoding
+                encoding = None
+                if serialized.data is None and not _not_modified(etag, encoding):
+                    schema = await state.get_schema_async(
+                        schema_path, with_refs=with_refs, resolved=resolved
+                    )
+        return _schema_response(
+            state,
+            schema_path,
+            schema_dir,
+            with_refs,
+            resolved,
+            etag,
+            encoding,
+            serialized,
+            schema,
+        )
 
     return blueprint
+
+
+def _parse_request(state, schema_path):
+    """Get the schema directory and the requested variant and encoding."""
+    try:
+        schema_dir = state.get_schema_dir(schema_path)
+    except JSONSchemaNotFound:
+        abort(404)
+
+    resolved = request.args.get(
+        "resolved", current_app.config.get("JSONSCHEMAS_RESOLVE_SCHEMA"), type=int
+    )
+
+    with_refs = (
+        request.args.get(
+            "refs", current_app.config.get("JSONSCHEMAS_REPLACE_REFS"), type=int
+        )
+        or resolved
+    )
+
+    encoding = None
+    if resolved or with_refs:
+        encoding = request.accept_encodings.best_match(state.precompress_encodings)
+    return schema_dir, with_refs, resolved, encoding
+
+
+def _encoded_etag(etag, encoding):
+    """Get the entity tag of an encoded response."""
+    return "{0}-{1}".format(etag, encoding) if encoding else etag
+
+
+def _not_modified(etag, encoding):
+    """Check if the client already has the schema."""
+    # If-None-Match uses the weak comparison, see RFC 9110 section 13.1.2
+    return request.if_none_match.contains_weak(_encoded_etag(etag, encoding))
+
+
+def _schema_response(
+    state,
+    schema_path,
+    schema_dir,
+    with_refs,
+    resolved,
+    etag,
+    encoding,
+    serialized,
+    schema=None,
+):
+    """Build the response serving a schema.
+
+    ``serialized`` is ``None`` if the client already has the schema or if the
+    schema file is served as is. Its data is ``None`` if ``schema`` is
+    streamed instead.
+    """
+    if _not_modified(etag, encoding):
+        response = current_app.response_class(status=304)
+    elif serialized is not None and serialized.data is not None:
+        data = serialized.encodings[encoding] if encoding else serialized.data
+        if isinstance(data, memoryview):
+            # only the encoding served is copied out of the shared cache
+            data = data.tobytes()
+        response = current_app.response_class(data, mimetype=current_app.json.mimetype)
+        if encoding:
+            response.content_encoding = encoding
+    elif schema is not None:
+        response = current_app.response_class(
+            state.iterencode(schema), mimetype=current_app.json.mimetype
+        )
+    else:
+        response = send_from_directory(schema_dir, schema_path)
+    if with_refs and state.precompress_encodings:
+        response.vary.add("Accept-Encoding")
+    response.set_etag(_encoded_etag(etag, encoding))
+    _set_cache_control(response, schema_path)
+    schema_requested.send(
+        state,
+        path=schema_path,
+        with_refs=bool(with_refs),
+        resolved=bool(resolved),
+        status=response.status_code,
+    )
+    return response
+
+
+def _set_cache_control(response, schema_path):
+    """Let clients cache the immutable schemas without revalidation."""
+    immutable_paths = current_app.config.get("JSONSCHEMAS_IMMUTABLE_PATHS")
+    if immutable_paths and re.search(immutable_paths, schema_path):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config[
+            "JSONSCHEMAS_IMMUTABLE_MAX_AGE"
+        ]
+        response.cache_control.immutable = True
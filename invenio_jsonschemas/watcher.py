@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Reload of the schemas modified on disk, for development."""
+
+from __future__ import absolute_import, print_function
+
+import os
+import threading
+from collections import namedtuple
+
+from .errors import JSONSchemaNotFound
+
+Changes = namedtuple("Changes", ["added", "removed", "modified"])
+"""Paths of the schemas added, removed and modified since the last poll."""
+
+
+class SchemaWatcher(object):
+    """Poll the directories of the registered schemas for changes.
+
+    New ``.json`` files are registered, removed ones are unregistered and
+    modified ones are registered again, which evicts them and the schemas
+    referencing them from the caches. Files which were already there but
+    are not registered, e.g. unregistered with
+    :meth:`invenio_jsonschemas.ext.InvenioJSONSchemasState.unregister_schema`,
+    are left alone. See
+    :py:const:`invenio_jsonschemas.config.JSONSCHEMAS_WATCH`.
+
+    Files are compared by modification time and size, so no platform
+    specific notification mechanism is needed.
+    """
+
+    def __init__(self, state, interval=1.0):
+        """Constructor.
+
+        :param state: :class:`invenio_jsonschemas.ext.InvenioJSONSchemasState`
+            instance whose schemas are watched.
+        :param interval: seconds between two polls of the background thread.
+        """
+        self.state = state
+        self.interval = interval
+        self.directories = set(state.schemas.values())
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._files = self._scan()
+
+    def poll(self):
+        """Apply the changes made to the schema files since the last poll.
+
+        :returns: A :class:`Changes`.
+        """
+        with self._lock:
+            scanned = set(self.directories)
+            self.directories.update(self.state.schemas.values())
+            files = self._scan()
+            added, removed, modified = [], [], []
+            for (directory, path), stat in sorted(files.items()):
+                if directory not in scanned:
+                    # first scan of the directory, nothing changed yet
+                    continue
+                previous = self._files.get((directory, path))
+                registered = self.state.schemas.get(path)
+                if previous is None and registered is None:
+                    self.state.register_schema(directory, path)
+                    added.append(path)
+                elif registered == directory and previous != stat:
+                    self.state.register_schema(directory, path)
+                    modified.append(path)
+            for directory, path in sorted(self._files.keys() - files.keys()):
+                if self.state.schemas.get(path) == directory:
+                    try:
+                        self.state.unregister_schema(path)
+                    except JSONSchemaNotFound:
+                        continue
+                    removed.append(path)
+            self._files = files
+        for kind, paths in zip(Changes._fields, (added, removed, modified)):
+            for path in paths:
+                self.state.app.logger.info("Schema {0} {1}".format(path, kind))
+        return Changes(added, removed, modified)
+
+    def start(self):
+        """Poll for changes in a background thread."""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="invenio-jsonschemas-watcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """Poll until stopped."""
+        while not self._stopped.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                self.state.app.logger.exception("Could not reload the schemas")
+
+    def _scan(self):
+        """Get the modification time and size of the schema files."""
+        files = {}
+        for directory in self.directories:
+            for root, dirs, filenames in os.walk(directory):
+                dir_path = os.path.relpath(root, directory)
+                if dir_path == ".":
+                    dir_path = ""
+                for filename in filenames:
+                    if not filename.lower().endswith(".json"):
+                        continue
+                    try:
+                        stat = os.stat(os.path.join(root, filename))
+                    except OSError:
+                        continue
+                    path = os.path.join(dir_path, filename)
+                    files[(directory, path)] = (stat.st_mtime_ns, stat.st_size)
+        return files
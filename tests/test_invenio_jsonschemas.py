@@ -7,25 +7,54 @@
 
 from __future__ import absolute_import, print_function
 
+import asyncio
+import gc
+import gzip
 import json
 import os
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 
 import mock
 import pytest
 from flask import Flask
+from jsonref import JsonRef
 from jsonresolver import JSONResolver
+from jsonresolver.contrib.jsonref import json_loader_factory
 from jsonresolver.contrib.jsonschema import ref_resolver_factory
-from jsonschema import validate
+from jsonschema import (
+    Draft4Validator,
+    Draft7Validator,
+    Draft202012Validator,
+    validate,
+)
 from jsonschema.exceptions import ValidationError
 
 from invenio_jsonschemas import (
     InvenioJSONSchemas,
     InvenioJSONSchemasAPI,
     InvenioJSONSchemasUI,
+    cli,
+    signals,
 )
 from invenio_jsonschemas.config import JSONSCHEMAS_URL_SCHEME
-from invenio_jsonschemas.errors import JSONSchemaDuplicate, JSONSchemaNotFound
-from invenio_jsonschemas.utils import resolve_schema
+from invenio_jsonschemas.errors import (
+    JSONSchemaDuplicate,
+    JSONSchemaIdMismatch,
+    JSONSchemaNotFound,
+)
+from invenio_jsonschemas.refs import RefExpander
+from invenio_jsonschemas.resolvers import (
+    SchemaResolver,
+    resolve_all_keywords,
+    resolve_all_of,
+)
+from invenio_jsonschemas.utils import resolve_schema, thaw
+from invenio_jsonschemas.watcher import SchemaWatcher
 
 
 def test_version():
@@ -150,6 +179,155 @@ def test_cache(app, dir_factory):
             assert m.counter == 2
 
 
+def test_schema_cache(app, dir_factory):
+    """Test the schema cache is bounded and keyed per state and host."""
+    app.config["JSONSCHEMAS_SCHEMA_CACHE_SIZE"] = 2
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    other_ext = InvenioJSONSchemas(Flask("otherapp"), entry_point_group=None)
+    schema_files = build_schemas(1)
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        other_ext.register_schemas_dir(directory)
+
+        ext.get_schema("rootschema_1.json")
+        ext.get_schema("rootschema_1.json")
+        assert ext.schema_cache.info()[:2] == (1, 1)
+        assert len(other_ext.schema_cache) == 0
+
+        ext.get_schema("sub1/subschema_1.json")
+        ext.get_schema("sub2/subschema_1.json")
+        assert len(ext.schema_cache) == 2
+        assert ext.schema_cache.info().evictions == 1
+
+        # the variants with replaced $ref are shared by all the request URLs
+        with app.test_request_context("/api/records/1", base_url="https://a.org"):
+            schema_a = ext.get_schema("rootschema_1.json", with_refs=True)
+        with app.test_request_context(base_url="http://b.org/api"):
+            schema_b = ext.get_schema("rootschema_1.json", with_refs=True)
+        assert schema_a is schema_b
+        assert ext.get_schema("rootschema_1.json", with_refs=True) is schema_a
+
+        ext.clear_caches()
+        assert len(ext.schema_cache) == 0
+
+
+def test_concurrent_cache_misses(app, dir_factory):
+    """Test concurrent requests of a schema which is not cached."""
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = {"root.json": '{"type": "object"}'}
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        state = app.extensions["invenio-jsonschemas"]
+        load_schema = state._load_schema
+        barrier = threading.Barrier(5)
+
+        def slow_load_schema(*args):
+            time.sleep(0.1)
+            return load_schema(*args)
+
+        def failing_load_schema(*args):
+            time.sleep(0.1)
+            raise ValueError("invalid schema")
+
+        def get_schema(_):
+            barrier.wait()
+            try:
+                return ext.get_schema("root.json")
+            except ValueError as e:
+                return e
+
+        for side_effect in (slow_load_schema, failing_load_schema):
+            with mock.patch.object(
+                state, "_load_schema", side_effect=side_effect
+            ) as load:
+                with ThreadPoolExecutor(max_workers=5) as executor:
+                    results = list(executor.map(get_schema, range(5)))
+            # the schema is loaded once, all the threads get the same result
+            assert load.call_count == 1
+            assert all(result is results[0] for result in results)
+            ext.clear_caches()
+        assert isinstance(results[0], ValueError)
+        assert len(state._single_flight) == 0
+        assert ext.get_schema("root.json") == {"type": "object"}
+
+        # a thread missing the cache just before the previous load ended
+        # does not load the schema again
+        cache_get = state.schema_cache.get
+        lookups = []
+
+        def late_get(key, default=None):
+            lookups.append(key)
+            return default if len(lookups) == 1 else cache_get(key, default)
+
+        with (
+            mock.patch.object(state.schema_cache, "get", side_effect=late_get),
+            mock.patch.object(state, "_load_schema") as load,
+        ):
+            assert ext.get_schema("root.json") == {"type": "object"}
+        assert len(lookups) == 2
+        assert not load.called
+
+
+def test_parsed_cache(app, dir_factory, tmpdir):
+    """Test the cache of the parsed schema files."""
+    cache_dir = str(tmpdir.join("parsed"))
+    app.config["JSONSCHEMAS_PARSED_CACHE_DIR"] = cache_dir
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = {"root.json": schema_template.format("test")}
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        assert ext.get_schema("root.json") == json.loads(schema_files["root.json"])
+        assert len(os.listdir(cache_dir)) == 1
+
+        # another process reads the parsed schema from the cache
+        ext.clear_caches()
+        with mock.patch("invenio_jsonschemas.ext.json.load") as load:
+            assert ext.get_schema("root.json") == json.loads(schema_files["root.json"])
+            assert not load.called
+
+        # modified files are parsed again
+        with open(os.path.join(directory, "root.json"), "w") as file_:
+            json.dump({"type": "string"}, file_)
+        ext.clear_caches()
+        assert ext.get_schema("root.json") == {"type": "string"}
+        ext.clear_caches()
+        with mock.patch("invenio_jsonschemas.ext.json.load") as load:
+            assert ext.get_schema("root.json") == {"type": "string"}
+            assert not load.called
+
+
+def test_read_only_schemas(app, dir_factory):
+    """Test cached schemas are read-only and not modified when resolved."""
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = {
+        "root.json": json.dumps(
+            {
+                "type": "object",
+                "allOf": [{"title": "Sub", "properties": {"foo": {"type": "string"}}}],
+            }
+        ),
+    }
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        schema = ext.get_schema("root.json")
+        with pytest.raises(TypeError):
+            schema["type"] = "string"
+        with pytest.raises(TypeError):
+            schema["allOf"].append({})
+
+        mutable_schema = deepcopy(schema)
+        mutable_schema["allOf"].append({})
+        assert type(mutable_schema["allOf"][0]) is dict
+        assert len(schema["allOf"]) == 1
+
+        assert resolve_schema(schema) == {
+            "type": "object",
+            "properties": {"foo": {"type": "string"}},
+        }
+        assert ext.get_schema("root.json", resolved=True) == resolve_schema(schema)
+        assert schema == json.loads(schema_files["root.json"])
+
+
 def test_register_schema(app, dir_factory):
     """Test register schema."""
     ext = InvenioJSONSchemas(app, entry_point_group=None)
@@ -179,6 +357,53 @@ def test_redefine(app, dir_factory):
         assert exc_info.value.schema in schema_files.keys()
 
 
+def test_load_schemas_dirs(app, dir_factory):
+    """Test loading the schemas of several directories eagerly."""
+    InvenioJSONSchemas(app, entry_point_group=None)
+    ext = app.extensions["invenio-jsonschemas"]
+    schema_files_1 = build_schemas(1)
+    schema_files_2 = build_schemas(2)
+    schema_files_2["invalid.json"] = '{"$id": "local://other.json"}'
+    with dir_factory(schema_files_1) as dir1, dir_factory(schema_files_2) as dir2:
+        with pytest.raises(JSONSchemaDuplicate):
+            ext.load_schemas_dirs([dir1, dir2, dir1], threads=2)
+        assert ext.schemas == {}
+
+        errors = ext.load_schemas_dirs([dir1, dir2], threads=2)
+        assert [(path, type(error)) for path, error in errors] == [
+            ("invalid.json", JSONSchemaIdMismatch)
+        ]
+        assert ext.schemas == dict(
+            [(path, dir1) for path in schema_files_1]
+            + [(path, dir2) for path in schema_files_2]
+        )
+        # the valid schemas are cached, but the store is not built
+        assert len(ext.schema_cache) == len(ext.etag_cache) == 8
+        assert ext._refresolver_store is None
+        with mock.patch("builtins.open", side_effect=AssertionError):
+            for path in schema_files_1:
+                assert ext.get_schema(path) == json.loads(schema_files_1[path])
+                assert ext.get_schema_etag(path)
+
+        ext.unregister_schema("invalid.json")
+        with dir_factory(build_schemas(3)) as dir3:
+            assert ext.load_schemas_dirs([dir3]) == []
+            assert len(ext.refresolver_store()) == 12
+
+
+def test_eager_load(app, pkg_factory, mock_entry_points):
+    """Test loading the schemas of the entry points at startup."""
+    app.config["JSONSCHEMAS_EAGER_LOAD"] = True
+    schema_files = build_schemas(1)
+    entry_point_group = "invenio_jsonschema_test_entry_point"
+    with pkg_factory(schema_files) as pkg1:
+        mock_entry_points.add(entry_point_group, "entry1", pkg1)
+        InvenioJSONSchemas(app, entry_point_group=entry_point_group)
+        ext = app.extensions["invenio-jsonschemas"]
+        assert set(ext._schemas) == set(schema_files)
+        assert len(ext.refresolver_store()) == len(schema_files)
+
+
 def test_view(app, pkg_factory, mock_entry_points):
     """Test view."""
     schema_files_1 = build_schemas(1)
@@ -217,6 +442,38 @@ def test_view(app, pkg_factory, mock_entry_points):
             assert res.status_code == 404
 
 
+def test_lazy_entry_points(app, pkg_factory, mock_entry_points):
+    """Test registering entry points without importing their packages."""
+    schema_files = build_schemas(1)
+    files = {"jsonschemas/" + name: schema for name, schema in schema_files.items()}
+    files["__init__.py"] = "raise RuntimeError('imported')"
+    files["jsonschemas/__init__.py"] = "raise RuntimeError('imported')"
+    duplicates = dict(schema_files)
+
+    entry_point_group = "invenio_jsonschema_test_entry_point"
+    with pkg_factory(files) as pkg1, pkg_factory(duplicates) as pkg2:
+        mock_entry_points.add(entry_point_group, "entry1", pkg1 + ".jsonschemas")
+        state = InvenioJSONSchemas(app, entry_point_group=entry_point_group)
+        ext = app.extensions["invenio-jsonschemas"]
+        assert ext._schemas == {}
+        assert set(ext.list_schemas()) == set(schema_files)
+        assert pkg1 not in sys.modules
+        for name in schema_files:
+            directory = state.get_schema_dir(name)
+            assert directory.endswith(os.path.join(pkg1, "jsonschemas"))
+
+        # duplicates are reported on every access
+        app2 = Flask("testapp2")
+        mock_entry_points.add(entry_point_group, "entry2", pkg2)
+        InvenioJSONSchemas(app2, entry_point_group=entry_point_group)
+        ext2 = app2.extensions["invenio-jsonschemas"]
+        for _ in range(2):
+            with pytest.raises(JSONSchemaDuplicate):
+                ext2.list_schemas()
+            with pytest.raises(JSONSchemaDuplicate):
+                ext2.get_schema(next(iter(schema_files)))
+
+
 def test_replace_refs_in_view(app, pkg_factory, mock_entry_points):
     """Test replace refs config in view."""
     schemas = {
@@ -296,6 +553,426 @@ def test_replace_resolve_in_view(app, pkg_factory, mock_entry_points):
             )
 
 
+def test_conditional_get_in_view(app, pkg_factory, mock_entry_points):
+    """Test entity tags and caching headers of the view."""
+    schemas = {
+        "root.json": '{"type": "object", "allOf": [{"title": "Sub"}]}',
+        "sub/schema-v1.0.0.json": schema_template.format("test"),
+    }
+
+    entry_point_group = "invenio_jsonschema_test_entry_point"
+    endpoint = "/testschemas"
+    app.config["JSONSCHEMAS_ENDPOINT"] = endpoint
+    app.config["JSONSCHEMAS_IMMUTABLE_PATHS"] = r"-v\d+\.\d+\.\d+\.json$"
+    with pkg_factory(schemas) as pkg1:
+        mock_entry_points.add(entry_point_group, "entry1", pkg1)
+        ext = InvenioJSONSchemas(entry_point_group=entry_point_group)
+        ext = ext.init_app(app)
+
+        with app.test_client() as client:
+            for url in ["root.json", "root.json?resolved=1"]:
+                url = "{0}/{1}".format(endpoint, url)
+                res = client.get(url)
+                assert res.status_code == 200
+                etag = res.get_etag()[0]
+                assert not res.cache_control.immutable
+
+                with mock.patch.object(ext, "get_serialized_schema") as serialize:
+                    res = client.get(url, headers={"If-None-Match": '"' + etag + '"'})
+                    assert res.status_code == 304
+                    assert res.get_etag() == (etag, False)
+                    assert not serialize.called
+
+                # weakened by a proxy
+                res = client.get(url, headers={"If-None-Match": 'W/"' + etag + '"'})
+                assert res.status_code == 304
+
+                res = client.get(url, headers={"If-None-Match": '"other"'})
+                assert res.status_code == 200
+
+            assert (
+                client.get(endpoint + "/root.json").get_etag()
+                != client.get(endpoint + "/root.json?resolved=1").get_etag()
+            )
+
+            res = client.get(endpoint + "/sub/schema-v1.0.0.json")
+            assert res.cache_control.immutable
+            assert res.cache_control.public
+            assert res.cache_control.max_age == 31536000
+
+
+def test_serialized_schemas_in_view(app, pkg_factory, mock_entry_points):
+    """Test resolved schemas are served from the serialized schemas cache."""
+    schemas = {"root.json": '{"type": "object", "allOf": [{"title": "Sub"}]}'}
+    resolved = {"type": "object"}
+
+    entry_point_group = "invenio_jsonschema_test_entry_point"
+    app.config["JSONSCHEMAS_PRECOMPRESS_ENCODINGS"] = ["gzip", "unknown"]
+    with pkg_factory(schemas) as pkg1:
+        mock_entry_points.add(entry_point_group, "entry1", pkg1)
+        ext = InvenioJSONSchemas(entry_point_group=entry_point_group)
+        ext = ext.init_app(app)
+        assert ext.precompress_encodings == ["gzip"]
+
+        with app.test_client() as client:
+            res = client.get("/schemas/root.json?resolved=1")
+            assert res.status_code == 200
+            assert res.content_encoding is None
+            assert json.loads(res.get_data(as_text=True)) == resolved
+            assert "Accept-Encoding" in res.vary
+            etag = res.get_etag()[0]
+
+            with mock.patch.object(ext, "get_schema") as get_schema:
+                res = client.get(
+                    "/schemas/root.json?resolved=1",
+                    headers={"Accept-Encoding": "gzip"},
+                )
+                assert not get_schema.called
+            assert res.content_encoding == "gzip"
+            assert json.loads(gzip.decompress(res.get_data())) == resolved
+            assert res.get_etag()[0] == etag + "-gzip"
+            assert ext.response_cache.info().size == 1
+
+            res = client.get("/schemas/root.json", headers={"Accept-Encoding": "gzip"})
+            assert res.content_encoding is None
+            assert json.loads(res.get_data(as_text=True)) == json.loads(
+                schemas["root.json"]
+            )
+
+
+def test_index(app, pkg_factory, mock_entry_points, tmpdir):
+    """Test registering the schemas from an index file."""
+    entry_point_group = "invenio_jsonschema_test_entry_point"
+    index_file = str(tmpdir.join("index.json"))
+    with pkg_factory(build_schemas(1)) as pkg1, pkg_factory(build_schemas(2)) as pkg2:
+        mock_entry_points.add(entry_point_group, "entry1", pkg1)
+        ext = InvenioJSONSchemas(app, entry_point_group=entry_point_group)
+        schemas = dict(ext.schemas)
+
+        runner = app.test_cli_runner()
+        result = runner.invoke(cli.index)
+        assert result.exit_code != 0
+        result = runner.invoke(cli.index, ["-o", index_file])
+        assert result.exit_code == 0
+
+        def new_state():
+            new_app = Flask("testapp")
+            new_app.config["JSONSCHEMAS_INDEX_FILE"] = index_file
+            return InvenioJSONSchemas(new_app, entry_point_group=entry_point_group)
+
+        with mock.patch(
+            "invenio_jsonschemas.ext.InvenioJSONSchemasState.register_schemas_dir"
+        ) as register_schemas_dir:
+            assert new_state().schemas == schemas
+            assert not register_schemas_dir.called
+
+        # the index is ignored if one of its directories does not exist anymore,
+        # e.g. when a package was reinstalled elsewhere with the same version
+        with open(index_file) as file_:
+            index = json.load(file_)
+        missing = str(tmpdir.join("missing"))
+        index["schemas"] = {path: missing for path in index["schemas"]}
+        with open(index_file, "w") as file_:
+            json.dump(index, file_)
+        assert new_state().schemas == schemas
+
+        # the index is ignored once the entry points change
+        mock_entry_points.add(entry_point_group, "entry2", pkg2)
+        assert set(new_state().list_schemas()) == set(build_schemas(1)) | set(
+            build_schemas(2)
+        )
+
+
+def test_warm(app, dir_factory):
+    """Test loading all the schemas in the caches."""
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = build_schemas(1)
+    schema_files["invalid.json"] = "{"
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        errors = ext.warm(with_refs=False, resolved=True, threads=2)
+        assert [path for path, _ in errors] == ["invalid.json"]
+        # raw and resolved schemas are loaded
+        assert len(ext.schema_cache) == 8
+        assert len(ext.response_cache) == 4
+
+        with mock.patch("invenio_jsonschemas.ext.open") as open_:
+            ext.get_schema("rootschema_1.json")
+            ext.get_schema_etag("rootschema_1.json")
+            ext.get_validator("rootschema_1.json")
+            # whatever the host, scheme or prefix of the request
+            for base_url in ("http://example.org", "https://localhost/api"):
+                with app.test_request_context(
+                    "/schemas/rootschema_1.json", base_url=base_url
+                ):
+                    ext.get_schema("rootschema_1.json", True, True)
+                    ext.get_serialized_schema("rootschema_1.json", True, True)
+            assert not open_.called
+
+        result = app.test_cli_runner().invoke(cli.warm, ["--no-refs"])
+        assert result.exit_code == 1
+        assert "invalid.json" in result.output
+
+
+def test_warm_on_init(app, pkg_factory, mock_entry_points):
+    """Test loading the schemas with $ref when initializing the app."""
+    # the URL map of a JSON resolver is built once, on its first use
+    app.config.update(
+        JSONSCHEMAS_WARM_ON_INIT=True,
+        JSONSCHEMAS_LOADER_CLS=json_loader_factory(
+            JSONResolver(plugins=["invenio_jsonschemas.jsonresolver"])
+        ),
+    )
+    schema_files = {
+        "root.json": json.dumps({"properties": {"sub": {"$ref": "sub.json"}}}),
+        "sub.json": '{"type": "string"}',
+    }
+    expected = {"properties": {"sub": {"type": "string"}}}
+    with pkg_factory(schema_files) as pkg1:
+        mock_entry_points.add("invenio_jsonschemas.schemas", "pkg1", pkg1)
+        # the $ref are replaced with the JSON resolver loader, which uses the
+        # registered extension
+        with mock.patch.object(app.logger, "warning") as warning:
+            ext = InvenioJSONSchemas(app)
+        assert not any(
+            "Could not load schema" in call.args[0] for call in warning.call_args_list
+        )
+        with mock.patch("invenio_jsonschemas.ext.open") as open_:
+            assert ext.get_schema("root.json", with_refs=True) == expected
+            assert ext.get_schema("root.json", True, True) == expected
+            assert not open_.called
+
+
+def test_shared_cache(app, dir_factory, tmpdir):
+    """Test the cache shared between processes."""
+    cache_file = str(tmpdir.join("schemas.cache"))
+    schema_files = {
+        "root.json": '{"type": "object", "allOf": [{"title": "Sub"}]}',
+        "other.json": schema_template.format("test"),
+    }
+    with dir_factory(schema_files) as directory:
+        ext = InvenioJSONSchemas(app, entry_point_group=None)
+        ext.register_schemas_dir(directory)
+        result = app.test_cli_runner().invoke(cli.warm, ["--shared-cache", cache_file])
+        assert result.exit_code == 0
+
+        new_app = Flask("testapp")
+        new_app.config.update(
+            JSONSCHEMAS_SHARED_CACHE_FILE=cache_file,
+            JSONSCHEMAS_PRECOMPRESS_ENCODINGS=["gzip"],
+        )
+        new_ext = InvenioJSONSchemas(new_app, entry_point_group=None)
+        new_ext.register_schemas_dir(directory)
+        with mock.patch("invenio_jsonschemas.ext.open") as open_:
+            assert new_ext.get_schema("root.json") == json.loads(
+                schema_files["root.json"]
+            )
+            assert new_ext.get_schema_etag("root.json") == ext.get_schema_etag(
+                "root.json"
+            )
+            with new_app.test_client() as client:
+                res = client.get(
+                    "/schemas/root.json?resolved=1", base_url="https://localhost"
+                )
+                assert res.status_code == 200
+                assert json.loads(res.get_data()) == {"type": "object"}
+                # the file was written without the gzip encoding
+                res = client.get(
+                    "/schemas/root.json?resolved=1",
+                    base_url="https://localhost",
+                    headers={"Accept-Encoding": "gzip"},
+                )
+                assert res.status_code == 200
+                assert res.content_encoding is None
+                assert json.loads(res.get_data()) == {"type": "object"}
+            assert not open_.called
+        assert len(new_ext.response_cache) == 0
+
+        # the schemas are not copied out of the file
+        shared = new_ext.shared_cache.get("root.json", False, False, None)
+        assert isinstance(shared.data, memoryview)
+        assert json.loads(shared.data.tobytes()) == json.loads(
+            schema_files["root.json"]
+        )
+
+        # the schemas of the shared cache are exported
+        output = str(tmpdir.join("single"))
+        manifest = new_ext.export_bundle(
+            output, paths=["root.json"], variants=("raw", "resolved"), single_file=True
+        )
+        with open(os.path.join(output, manifest["bundle"])) as file_:
+            assert json.load(file_) == {
+                "raw": {"root.json": json.loads(schema_files["root.json"])},
+                "resolved": {"root.json": {"type": "object"}},
+            }
+
+        # the cache is ignored when the registered schemas change
+        new_ext.register_schema(directory, "root.json")
+        new_ext.schemas.pop("other.json")
+        assert new_ext.shared_cache is None
+        new_ext.clear_caches()
+        assert new_ext.get_schema("root.json", resolved=True) == {"type": "object"}
+
+
+def test_get_schema_async(app, dir_factory):
+    """Test the asynchronous retrieval of the schemas."""
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = {"root.json": '{"type": "object", "allOf": [{"title": "Sub"}]}'}
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        state = app.extensions["invenio-jsonschemas"]
+        load_schema = state._load_schema
+
+        def slow_load_schema(*args):
+            time.sleep(0.1)
+            return load_schema(*args)
+
+        async def get_schemas():
+            return await asyncio.gather(
+                *(ext.get_schema_async("root.json", resolved=True) for _ in range(5))
+            )
+
+        with mock.patch.object(
+            state, "_load_schema", side_effect=slow_load_schema
+        ) as load:
+            with app.test_request_context():
+                schemas = asyncio.run(get_schemas())
+        # the concurrent calls share a single load
+        assert load.call_count == 1
+        assert all(schema is schemas[0] for schema in schemas)
+        assert schemas[0] == {"type": "object"}
+        assert not state._async_calls
+
+        with app.app_context():
+            assert asyncio.run(ext.get_schema_async("root.json")) == json.loads(
+                schema_files["root.json"]
+            )
+            assert asyncio.run(
+                ext.get_schema_etag_async("root.json")
+            ) == ext.get_schema_etag("root.json")
+        with app.test_request_context():
+            serialized = asyncio.run(
+                ext.get_serialized_schema_async("root.json", resolved=True)
+            )
+        assert json.loads(serialized.data) == {"type": "object"}
+        with pytest.raises(JSONSchemaNotFound):
+            asyncio.run(ext.get_schema_async("not_existing_schema.json"))
+
+
+def test_async_view(app, pkg_factory, mock_entry_points):
+    """Test the asynchronous view."""
+    pytest.importorskip("asgiref")
+    app.config["JSONSCHEMAS_ASYNC_VIEWS"] = True
+    schema_files = build_schemas(1)
+    with pkg_factory(schema_files) as pkg1:
+        mock_entry_points.add("invenio_jsonschemas.schemas", "pkg1", pkg1)
+        InvenioJSONSchemas(app)
+        with app.test_client() as client:
+            res = client.get("/schemas/sub1/subschema_1.json?resolved=1")
+            assert res.status_code == 200
+            assert json.loads(res.get_data()) == json.loads(
+                schema_files["sub1/subschema_1.json"]
+            )
+            res = client.get(
+                "/schemas/sub1/subschema_1.json?resolved=1",
+                headers={"If-None-Match": res.headers["ETag"]},
+            )
+            assert res.status_code == 304
+
+
+def test_bundle(app, dir_factory, tmpdir):
+    """Test the export of the schemas as static files."""
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = {
+        "root.json": '{"type": "object", "allOf": [{"title": "Sub"}]}',
+        "sub/schema.json": schema_template.format("test"),
+    }
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        output = str(tmpdir.join("bundle"))
+        runner = app.test_cli_runner()
+        result = runner.invoke(cli.bundle, [output, "-v", "raw", "-v", "resolved"])
+        assert result.exit_code == 0
+        with open(os.path.join(output, "manifest.json")) as file_:
+            manifest = json.load(file_)
+        assert sorted(manifest["schemas"]) == ["root.json", "sub/schema.json"]
+        entry = manifest["schemas"]["root.json"]
+        assert entry["url"] == ext.path_to_url("root.json")
+        assert entry["resolved"]["file"].startswith("resolved/root.")
+        assert entry["raw"]["file"] != entry["resolved"]["file"]
+        with open(os.path.join(output, entry["resolved"]["file"])) as file_:
+            assert json.load(file_) == {"type": "object"}
+        with open(os.path.join(output, entry["raw"]["file"])) as file_:
+            assert json.load(file_) == json.loads(schema_files["root.json"])
+
+        result = runner.invoke(cli.bundle, [output, "-s", "invalid.json"])
+        assert result.exit_code == 2
+
+        output = str(tmpdir.join("single"))
+        with app.app_context():
+            manifest = ext.export_bundle(output, paths=["root.json"], single_file=True)
+        assert list(manifest["schemas"]) == ["root.json"]
+        assert "file" not in manifest["schemas"]["root.json"]["resolved"]
+        with open(os.path.join(output, manifest["bundle"])) as file_:
+            assert json.load(file_) == {"resolved": {"root.json": {"type": "object"}}}
+
+
+def test_metrics(app, pkg_factory, mock_entry_points):
+    """Test the signals and the metrics."""
+    app.config.update(
+        JSONSCHEMAS_METRICS=True,
+        JSONSCHEMAS_METRICS_URL="/metrics/jsonschemas",
+    )
+    schema_files = {"root.json": '{"type": "object", "allOf": [{"title": "Sub"}]}'}
+    with pkg_factory(schema_files) as pkg1:
+        mock_entry_points.add("invenio_jsonschemas.schemas", "pkg1", pkg1)
+        ext = InvenioJSONSchemas(app)
+        received = []
+
+        def receiver(sender, **kwargs):
+            received.append(kwargs)
+
+        with signals.schema_resolved.connected_to(receiver, sender=ext._state):
+            with app.test_client() as client:
+                assert client.get("/schemas/root.json?resolved=1").status_code == 200
+                assert client.get("/schemas/root.json?resolved=1").status_code == 200
+                assert client.get("/schemas/root.json").status_code == 200
+                assert client.get("/schemas/root.json").status_code == 200
+                res = client.get("/metrics/jsonschemas")
+        assert len(received) == 1
+        assert received[0]["path"] == "root.json"
+        assert received[0]["duration"] >= 0
+
+        assert res.status_code == 200
+        assert res.content_type == "text/plain; version=0.0.4; charset=utf-8"
+        metrics = res.get_data(as_text=True)
+        assert "# TYPE invenio_jsonschemas_requests_total counter" in metrics
+        for line in (
+            'requests_total{path="root.json",variant="resolved",status="200"} 2',
+            'requests_total{path="root.json",variant="raw",status="200"} 2',
+            'operation_duration_seconds_count{operation="resolve",path="root.json"} 1',
+            'operation_duration_seconds_count{operation="serialize",path="root.json"} 1',
+            'operation_duration_seconds_bucket{operation="load",path="root.json",le="+Inf"}',
+            'cache_hits_total{cache="response"} 2',
+            'serialized_bytes{path="root.json"} 18',
+        ):
+            assert "invenio_jsonschemas_" + line in metrics
+
+        ext.metrics.disconnect()
+        with app.test_client() as client:
+            client.get("/schemas/root.json?resolved=1")
+        assert ext.metrics.to_prometheus().count("variant=") == 2
+
+    # the metrics do not keep the state alive
+    app2 = Flask("testapp2")
+    app2.config["JSONSCHEMAS_METRICS"] = True
+    InvenioJSONSchemas(app2, entry_point_group=None)
+    state = weakref.ref(app2.extensions["invenio-jsonschemas"])
+    del app2
+    gc.collect()
+    assert state() is None
+
+
 def test_alternative_entry_point_group_init(app, pkg_factory, mock_entry_points):
     """Test initializing the entry_point_group after creating the extension."""
     schema_files_1 = build_schemas(1)
@@ -403,6 +1080,54 @@ def test_url_mapping(app, dir_factory, url_scheme):
             assert ext.path_to_url("invalid.json") is None
 
 
+def test_url_index(app, dir_factory):
+    """Test the index of the schema URLs."""
+    app.config.update(
+        JSONSCHEMAS_HOST="inveniosoftware.org",
+        JSONSCHEMAS_URL_ALIASES=["http://legacy.org/old/"],
+    )
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = build_schemas(1)
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        path = "sub1/subschema_1.json"
+        url = "https://inveniosoftware.org/schemas/sub1/subschema_1.json"
+        index = ext.url_index()
+        assert index[url] == path
+        assert index["http://inveniosoftware.org/schemas/" + path] == path
+        assert index["http://legacy.org/old/" + path] == path
+        assert len(index) == 3 * len(schema_files)
+        assert ext.path_to_url(path) == url
+
+        with (
+            mock.patch.object(ext.url_map, "bind") as bind,
+            mock.patch("invenio_jsonschemas.ext.MappingProxyType") as proxy,
+        ):
+            assert ext.url_to_path(url) == path
+            assert ext.url_to_path(url + "#/properties") == path
+            assert ext.url_to_path("http://legacy.org/old/" + path + "?x=1") == path
+            assert ext.path_to_url(path) == url
+            assert ext.urls_to_paths([url]) == {url: path}
+            assert not bind.called
+            # the read-only view is only built for the public accessor
+            assert not proxy.called
+        assert ext.url_to_path("http://example.org/schemas/" + path) is None
+        assert ext.urls_to_paths([url, url, "http://example.org/invalid.json"]) == {
+            url: path,
+            "http://example.org/invalid.json": None,
+        }
+
+        # the index follows the registered schemas
+        new_url = "https://inveniosoftware.org/schemas/new.json"
+        assert ext.url_to_path(new_url) is None
+        ext.register_schema(directory, "new.json")
+        assert ext.url_index()[new_url] == "new.json"
+        assert ext.url_to_path(new_url) == "new.json"
+        ext.unregister_schema("new.json")
+        assert new_url not in ext.url_index()
+        assert ext.url_to_path(new_url) is None
+
+
 @pytest.mark.parametrize(
     "whitelisted, expected",
     [
@@ -468,6 +1193,371 @@ def test_resolve_schema():
     assert resolve_schema(test_schema) == resolved_schema
 
 
+def test_resolve_all_of():
+    """Test the alternative allOf resolver gives the default resolver result."""
+    schema = {
+        "definitions": {
+            "person": {
+                "title": "Person",
+                "allOf": [
+                    {"properties": {"name": {"type": "string"}}},
+                    {"properties": {"age": {"type": "integer"}}, "title": "Age"},
+                ],
+            }
+        },
+        "type": "object",
+        "allOf": [
+            {"$ref": "#/definitions/person"},
+            {"allOf": [{"properties": {"nested": {"type": "string"}}}]},
+        ],
+        "properties": {
+            "author": {"$ref": "#/definitions/person"},
+            "editors": {"type": "array", "items": {"$ref": "#/definitions/person"}},
+        },
+    }
+    original = deepcopy(schema)
+    expected = resolve_schema(JsonRef.replace_refs(schema))
+    resolved = resolve_all_of(JsonRef.replace_refs(schema))
+    assert json.dumps(resolved) == json.dumps(expected)
+    assert schema == original
+    # the sub-schemas referenced several times are resolved once
+    assert (
+        resolved["properties"]["author"] is resolved["properties"]["editors"]["items"]
+    )
+
+
+def test_resolve_all_keywords():
+    """Test the resolver of all the sub-schemas."""
+
+    def all_of(name):
+        return {"allOf": [{"type": "object"}, {"title": "T", "required": [name]}]}
+
+    def resolved(name):
+        return {"type": "object", "required": [name]}
+
+    schema = {
+        "definitions": {"def": all_of("def")},
+        "additionalProperties": all_of("additional"),
+        "patternProperties": {"^a": all_of("pattern")},
+        "items": [all_of("item1"), {"items": all_of("item2")}],
+        "oneOf": [all_of("one")],
+        "dependencies": {"a": ["b"], "c": all_of("dependency")},
+        "enum": [all_of("data")],
+        "x-custom": all_of("custom"),
+    }
+    original = deepcopy(schema)
+    expected = {
+        "definitions": {"def": resolved("def")},
+        "additionalProperties": resolved("additional"),
+        "patternProperties": {"^a": resolved("pattern")},
+        "items": [resolved("item1"), {"items": resolved("item2")}],
+        "oneOf": [resolved("one")],
+        "dependencies": {"a": ["b"], "c": resolved("dependency")},
+        "enum": [all_of("data")],
+        "x-custom": all_of("custom"),
+    }
+    assert resolve_all_keywords(schema) == expected
+    assert schema == original
+
+    resolver = SchemaResolver()
+    resolver.register("x-custom")
+    expected["x-custom"] = resolved("custom")
+    assert resolver(schema) == expected
+    assert "x-custom" not in resolve_all_keywords.keywords
+
+
+def test_ref_expander(app, dir_factory):
+    """Test the expansion of recursive and deeply nested references."""
+    app.config["JSONSCHEMAS_REF_EXPANDER_CLS"] = "invenio_jsonschemas.refs.RefExpander"
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = {
+        "a.json": json.dumps(
+            {
+                "type": "object",
+                "properties": {
+                    "self": {"$ref": "#"},
+                    "b": {"$ref": "b.json"},
+                    "b2": {"$ref": "b.json"},
+                    "d": {"$ref": "local://d.json"},
+                },
+            }
+        ),
+        "b.json": json.dumps(
+            {
+                "properties": {
+                    "a": {"$ref": "a.json"},
+                    "c": {"$ref": "c.json#/definitions/c"},
+                }
+            }
+        ),
+        "c.json": json.dumps({"definitions": {"c": {"type": "string"}}}),
+        "d.json": json.dumps({"items": {"$ref": "e.json"}}),
+        "e.json": json.dumps({"items": {"$ref": "d.json"}}),
+    }
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        with app.test_request_context(ext.path_to_url("a.json")):
+            schema = ext.get_schema("a.json", with_refs=True)
+        properties = schema["properties"]
+        assert properties["self"] == {"$ref": "#"}
+        # the schemas referred to several times are not repeated
+        assert properties["b"] == properties["b2"] == {"$ref": "#/$defs/b.json"}
+        assert schema["$defs"]["b.json"]["properties"] == {
+            "a": {"$ref": "#"},
+            "c": {"type": "string"},
+        }
+        # the cycle between d.json and e.json is cut at the first repetition
+        assert properties["d"] == {"items": {"items": {"$ref": "#/$defs/d.json"}}}
+        assert schema["$defs"]["d.json"] == properties["d"]
+
+        with app.app_context():
+            expander = RefExpander(ext, max_inline_depth=1)
+            schema = expander.expand(
+                ext.get_schema("a.json"), base_uri=ext.path_to_url("a.json")
+            )
+        assert schema["properties"]["d"] == {"$ref": "#/$defs/d.json"}
+        assert schema["$defs"]["d.json"] == {
+            "items": {"items": {"$ref": "#/$defs/d.json"}}
+        }
+        # the original schema is not modified
+        assert ext.get_schema("a.json")["properties"]["b"] == {"$ref": "b.json"}
+
+
+def test_ref_expander_ids(app, dir_factory):
+    """Test validating against schemas with $id expanded by the RefExpander."""
+    app.config["JSONSCHEMAS_REF_EXPANDER_CLS"] = "invenio_jsonschemas.refs.RefExpander"
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = {
+        "person.json": json.dumps(
+            {
+                "$id": "local://person.json",
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "friend": {"$ref": "#"},
+                },
+            }
+        ),
+        "tree.json": json.dumps(
+            {
+                "$schema": "https://json-schema.org/draft/2020-12/schema",
+                "$id": "local://tree.json",
+                "type": "object",
+                "properties": {
+                    "owner": {"$ref": "person.json"},
+                    "members": {"type": "array", "items": {"$ref": "person.json"}},
+                },
+            }
+        ),
+    }
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        with app.test_request_context(ext.path_to_url("tree.json")):
+            schema = ext.get_schema("tree.json", with_refs=True)
+    assert schema["$id"] == "local://tree.json"
+    assert "$id" not in schema["$defs"]["person.json"]
+    validator = Draft202012Validator(thaw(schema))
+    validator.validate(
+        {
+            "owner": {"name": "a", "friend": {"name": "b", "friend": {}}},
+            "members": [{"name": "c", "friend": {"name": "d"}}],
+        }
+    )
+    for instance in (
+        {"owner": {"friend": {"name": 1}}},
+        {"members": [{"friend": {"friend": {"name": 1}}}]},
+    ):
+        with pytest.raises(ValidationError):
+            validator.validate(instance)
+
+
+def test_dependency_graph(app, dir_factory):
+    """Test the graph of references and the eviction of the dependents."""
+    app.config["JSONSCHEMAS_REF_EXPANDER_CLS"] = "invenio_jsonschemas.refs.RefExpander"
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = {
+        "root.json": json.dumps({"items": {"$ref": "sub/a.json#/definitions/a"}}),
+        "sub/a.json": json.dumps(
+            {"definitions": {"a": {"$ref": "local://sub/b.json"}}, "not": {"$ref": "#"}}
+        ),
+        "sub/b.json": json.dumps({"type": "string"}),
+        "other.json": schema_template.format("test"),
+    }
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        graph = ext.dependency_graph()
+        assert ext.dependency_graph() is graph
+        assert graph.dependencies("root.json") == {"sub/a.json"}
+        assert graph.dependencies("root.json", transitive=True) == {
+            "sub/a.json",
+            "sub/b.json",
+        }
+        assert graph.dependents("sub/b.json") == {"sub/a.json"}
+        assert graph.dependents("sub/b.json", transitive=True) == {
+            "root.json",
+            "sub/a.json",
+        }
+        assert graph.dependents("other.json") == set()
+        order = graph.topological_order()
+        assert sorted(order) == sorted(schema_files)
+        assert order.index("sub/b.json") < order.index("sub/a.json")
+        assert order.index("sub/a.json") < order.index("root.json")
+
+        with app.test_request_context(ext.path_to_url("root.json")):
+            assert ext.get_schema("root.json", with_refs=True) == {
+                "items": {"type": "string"}
+            }
+        validator = ext.get_validator("other.json")
+        root_validator = ext.get_validator("root.json")
+        assert len(ext.schema_cache) == 5
+
+        # only the changed schema and the variants embedding it are evicted
+        with open(os.path.join(directory, "sub/b.json"), "w") as file_:
+            json.dump({"$ref": "../other.json"}, file_)
+        ext.register_schema(directory, "sub/b.json")
+        assert len(ext.schema_cache) == 3
+        assert ext.get_validator("other.json") is validator
+        assert ext.get_validator("root.json") is not root_validator
+        assert graph.dependencies("sub/b.json") == {"other.json"}
+        assert graph.dependents("other.json", transitive=True) == {
+            "root.json",
+            "sub/a.json",
+            "sub/b.json",
+        }
+        with app.test_request_context(ext.path_to_url("root.json")):
+            assert ext.get_schema("root.json", with_refs=True) == {
+                "items": json.loads(schema_files["other.json"])
+            }
+
+
+def test_dependency_graph_incremental(app, dir_factory):
+    """Test the eviction of the dependents without reading all the schemas."""
+    app.config["JSONSCHEMAS_REF_EXPANDER_CLS"] = "invenio_jsonschemas.refs.RefExpander"
+    schema_files = {
+        "root.json": json.dumps({"items": {"$ref": "a.json"}}),
+        "a.json": json.dumps({"items": {"$ref": "b.json"}}),
+        "b.json": json.dumps({"type": "string"}),
+        "other.json": schema_template.format("test"),
+        "unused.json": json.dumps({"$ref": "b.json"}),
+    }
+    with dir_factory(schema_files) as directory:
+        ext = InvenioJSONSchemas(app, entry_point_group=None)
+        ext.register_schemas_dir(directory)
+        state = app.extensions["invenio-jsonschemas"]
+        assert ext.get_schema("root.json", with_refs=True) == {
+            "items": {"items": {"type": "string"}}
+        }
+        validator = ext.get_validator("other.json")
+
+        with open(os.path.join(directory, "b.json"), "w") as file_:
+            json.dump({"type": "number"}, file_)
+        with mock.patch.object(
+            state, "_parse_schema_file", wraps=state._parse_schema_file
+        ) as parse:
+            ext.register_schema(directory, "b.json")
+            ext.register_schema(directory, "unused.json")
+            assert not parse.called
+            assert ext.get_schema("root.json", with_refs=True) == {
+                "items": {"items": {"type": "number"}}
+            }
+            # only the evicted schemas are read again
+            assert sorted(call.args[0] for call in parse.call_args_list) == [
+                os.path.join(directory, "b.json"),
+                os.path.join(directory, "root.json"),
+            ]
+        assert ext.get_validator("other.json") is validator
+
+        # the graph is completed on first access
+        assert ext.dependency_graph().dependents("b.json", transitive=True) == {
+            "a.json",
+            "root.json",
+            "unused.json",
+        }
+
+
+def test_watcher(app, dir_factory):
+    """Test the reload of the schemas modified on disk."""
+    app.config.update(
+        JSONSCHEMAS_REF_EXPANDER_CLS="invenio_jsonschemas.refs.RefExpander",
+        JSONSCHEMAS_WATCH=True,
+        JSONSCHEMAS_WATCH_INTERVAL=60,
+    )
+    schema_files = {
+        "root.json": json.dumps({"items": {"$ref": "sub/schema.json"}}),
+        "sub/schema.json": json.dumps({"type": "string"}),
+        "other.json": json.dumps({"type": "number"}),
+    }
+    with dir_factory(schema_files) as directory:
+        ext = InvenioJSONSchemas(app, entry_point_group=None)
+        assert ext.watcher is not None
+        ext.watcher.stop()
+        ext.register_schemas_dir(directory)
+        watcher = SchemaWatcher(app.extensions["invenio-jsonschemas"])
+        assert watcher.poll() == ([], [], [])
+
+        with app.test_request_context(ext.path_to_url("root.json")):
+            assert ext.get_schema("root.json", with_refs=True) == {
+                "items": {"type": "string"}
+            }
+        other = ext.get_schema("other.json")
+
+        with open(os.path.join(directory, "sub/schema.json"), "w") as file_:
+            json.dump({"type": "integer"}, file_)
+        with open(os.path.join(directory, "new.json"), "w") as file_:
+            json.dump({"type": "null"}, file_)
+        os.remove(os.path.join(directory, "other.json"))
+        assert watcher.poll() == (["new.json"], ["other.json"], ["sub/schema.json"])
+        assert sorted(ext.list_schemas()) == [
+            "new.json",
+            "root.json",
+            "sub/schema.json",
+        ]
+        assert ext.get_schema("new.json") == {"type": "null"}
+        with app.test_request_context(ext.path_to_url("root.json")):
+            assert ext.get_schema("root.json", with_refs=True) == {
+                "items": {"type": "integer"}
+            }
+        with pytest.raises(JSONSchemaNotFound):
+            ext.get_schema("other.json")
+        assert other == {"type": "number"}
+        assert watcher.poll() == ([], [], [])
+
+
+def test_watcher_unregistered(app, dir_factory):
+    """Test the watcher leaves the files which are not registered alone."""
+    schema_files = {
+        "registered.json": json.dumps({"type": "string"}),
+        "ignored.json": json.dumps({"type": "number"}),
+        "unregistered.json": json.dumps({"type": "null"}),
+    }
+    with dir_factory(schema_files) as directory:
+        ext = InvenioJSONSchemas(app, entry_point_group=None)
+        ext.register_schema(directory, "registered.json")
+        ext.register_schema(directory, "unregistered.json")
+        watcher = SchemaWatcher(app.extensions["invenio-jsonschemas"])
+        ext.unregister_schema("unregistered.json")
+        assert watcher.poll() == ([], [], [])
+        assert list(ext.list_schemas()) == ["registered.json"]
+
+        # even when they are modified
+        with open(os.path.join(directory, "ignored.json"), "w") as file_:
+            json.dump({"type": "integer"}, file_)
+        with open(os.path.join(directory, "new.json"), "w") as file_:
+            json.dump({"type": "null"}, file_)
+        assert watcher.poll() == (["new.json"], [], [])
+        assert sorted(ext.list_schemas()) == ["new.json", "registered.json"]
+
+        # the files of a directory registered later are not new
+        with dir_factory({"other.json": "{}", "unused.json": "{}"}) as other:
+            ext.register_schema(other, "other.json")
+            assert watcher.poll() == ([], [], [])
+            assert sorted(ext.list_schemas()) == [
+                "new.json",
+                "other.json",
+                "registered.json",
+            ]
+
+
 def test_export_refresolver_store(app, dir_factory):
     """Test export local ref resolver store."""
     ext = InvenioJSONSchemas(app, entry_point_group=None)
@@ -480,3 +1570,192 @@ def test_export_refresolver_store(app, dir_factory):
             assert schema.startswith(
                 app.config.get("JSONSCHEMAS_LOCAL_REFRESOLVER_URI_SCHEME")
             )
+
+
+def test_refresolver_store_incremental(app, dir_factory):
+    """Test the local ref resolver store is built once and kept up to date."""
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = build_schemas(1)
+    uri_scheme = app.config.get("JSONSCHEMAS_LOCAL_REFRESOLVER_URI_SCHEME")
+    with dir_factory(schema_files) as directory:
+        ext.register_schema(directory, "rootschema_1.json")
+        store = ext.refresolver_store()
+        assert set(store) == {uri_scheme + "rootschema_1.json"}
+        assert ext.refresolver_store() is store
+        with pytest.raises(TypeError):
+            store["foo"] = {}
+
+        ext.register_schema(directory, "sub1/subschema_1.json")
+        assert uri_scheme + "sub1/subschema_1.json" in store
+        assert store[uri_scheme + "sub1/subschema_1.json"] == json.loads(
+            schema_files["sub1/subschema_1.json"]
+        )
+
+
+def test_get_validator(app, dir_factory):
+    """Test compiled and cached validators."""
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = {
+        "root.json": json.dumps(
+            {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "relative": {"$ref": "sub/schema.json"},
+                    "local": {"$ref": "local://sub/schema.json"},
+                },
+            }
+        ),
+        "sub/schema.json": schema_template.format("test"),
+        "sub/relative.json": json.dumps({"$ref": "schema.json"}),
+    }
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        validator = ext.get_validator("root.json")
+        assert ext.get_validator("root.json") is validator
+        assert validator.is_valid({"relative": {"test": 1}, "local": {"test": 2}})
+        assert not validator.is_valid({"relative": {"test": "not_a_number"}})
+        assert not validator.is_valid({"local": {"test": "not_a_number"}})
+
+        # references are relative to the schema, even without "$id", and with
+        # the drafts ignoring the keywords next to a "$ref"
+        for draft in (None, Draft4Validator, Draft7Validator):
+            validator = ext.get_validator("sub/relative.json", draft=draft)
+            assert validator.is_valid({"test": 1})
+            assert not validator.is_valid({"test": "not_a_number"})
+        validator = ext.get_validator("root.json")
+
+        # re-registering a schema drops the cached validators
+        ext.register_schema(directory, "sub/schema.json")
+        assert ext.get_validator("root.json") is not validator
+
+        with pytest.raises(JSONSchemaNotFound):
+            ext.get_validator("not_existing_schema.json")
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_iter_validate(app, dir_factory, processes):
+    """Test bulk validation of records."""
+    app.config["JSONSCHEMAS_HOST"] = "inveniosoftware.org"
+    ext = InvenioJSONSchemas(app, entry_point_group=None)
+    schema_files = {
+        "root.json": json.dumps(
+            {"type": "object", "properties": {"sub": {"$ref": "sub/schema.json"}}}
+        ),
+        "sub/schema.json": schema_template.format("test"),
+        "sub/relative.json": json.dumps({"$ref": "schema.json"}),
+    }
+    root_url = "https://inveniosoftware.org/schemas/root.json"
+    sub_url = "https://inveniosoftware.org/schemas/sub/schema.json"
+    relative_url = "https://inveniosoftware.org/schemas/sub/relative.json"
+    with dir_factory(schema_files) as directory:
+        ext.register_schemas_dir(directory)
+        items = [
+            (root_url, {"sub": {"test": 1}}),
+            (sub_url, {"test": "not_a_number"}),
+            (root_url, {"sub": {"test": "not_a_number"}}),
+            (sub_url, {"test": 2}),
+            (relative_url, {"test": "not_a_number"}),
+        ]
+        results = list(ext.iter_validate(items, processes=processes, chunk_size=1))
+        assert [r.path for r in results] == [
+            "root.json",
+            "sub/schema.json",
+            "root.json",
+            "sub/schema.json",
+            "sub/relative.json",
+        ]
+        assert [r.record for r in results] == [record for _, record in items]
+        assert [len(r.errors) for r in results] == [0, 1, 1, 0, 1]
+        assert list(results[2].errors[0].path) == ["sub", "test"]
+
+        assert [r.error for r in results] == [None] * 5
+
+        # an unknown schema does not stop the validation of the other records
+        invalid_url = "https://example.org/invalid.json"
+        items = [(invalid_url, {}), (sub_url, {"test": "not_a_number"})]
+        results = list(ext.iter_validate(items, processes=processes, chunk_size=2))
+        assert results[0].path is None
+        assert results[0].errors == []
+        assert isinstance(results[0].error, JSONSchemaNotFound)
+        assert results[0].error.schema == invalid_url
+        assert results[1].path == "sub/schema.json"
+        assert len(results[1].errors) == 1
+        assert results[1].error is None
+
+
+def test_streaming(app, pkg_factory, mock_entry_points):
+    """Test streaming the large schemas with replaced $ref or resolved."""
+    app.config.update(
+        JSONSCHEMAS_STREAM_CHUNK_SIZE=16,
+        JSONSCHEMAS_STREAM_MIN_SIZE=64,
+        JSONSCHEMAS_PRECOMPRESS_ENCODINGS=["gzip"],
+    )
+    schema = {
+        "type": "object",
+        "allOf": [
+            {"properties": {"field_{0}".format(i): {"type": "string"}}}
+            for i in range(20)
+        ],
+    }
+    schema_files = {"root.json": json.dumps(schema), "small.json": '{"type": "string"}'}
+    with pkg_factory(schema_files) as pkg1:
+        mock_entry_points.add("invenio_jsonschemas.schemas", "pkg1", pkg1)
+        ext = InvenioJSONSchemas(app)
+        assert ext.streaming
+        resolved = ext.get_schema("root.json", with_refs=True, resolved=True)
+        chunks = list(ext.iterencode(resolved))
+        expected = ext._serialize(resolved)
+        assert len(chunks) > 1
+        assert all(len(chunk) < 16 + 20 for chunk in chunks)
+        assert b"".join(chunks) == expected.data
+
+        headers = {"Accept-Encoding": "gzip"}
+        with app.test_client() as client:
+            state = app.extensions["invenio-jsonschemas"]
+            with mock.patch.object(
+                state, "iterencode", wraps=state.iterencode
+            ) as encode:
+                res = client.get("/schemas/root.json?resolved=1", headers=headers)
+                assert res.status_code == 200
+                assert "Content-Length" not in res.headers
+                assert res.content_encoding is None
+                assert res.data == expected.data
+                assert res.get_etag()[0] == expected.etag
+                # hashed, then sent
+                assert encode.call_count == 2
+                # only the entity tag is cached
+                serialized = ext.get_serialized_schema(
+                    "root.json", True, True, streamed=True
+                )
+                assert serialized == (None, expected.etag, {})
+
+                res = client.get("/schemas/root.json?resolved=1", headers=headers)
+                assert res.data == expected.data
+                assert encode.call_count == 3
+
+                res = client.get(
+                    "/schemas/root.json?resolved=1",
+                    headers={"If-None-Match": expected.etag},
+                )
+                assert res.status_code == 304
+                assert encode.call_count == 3
+
+                # small schemas are encoded once and cached
+                for _ in range(2):
+                    res = client.get("/schemas/small.json?resolved=1", headers=headers)
+                    assert res.content_encoding == "gzip"
+                    assert "Content-Length" in res.headers
+                    assert gzip.decompress(res.data) == b'{"type":"string"}\n'
+                assert encode.call_count == 4
+
+            # the data is encoded when requested
+            assert (
+                ext.get_serialized_schema("root.json", True, True).data == expected.data
+            )
+            res = client.get("/schemas/root.json?resolved=1", headers=headers)
+            assert res.content_encoding == "gzip"
+            assert gzip.decompress(res.data) == expected.data
+
+        app.json.compact = False
+        assert b"".join(ext.iterencode(resolved)) == ext._serialize(resolved).data